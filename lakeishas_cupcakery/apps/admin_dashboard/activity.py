@@ -0,0 +1,118 @@
+"""
+The dashboard activity feed.
+
+Events are appended to :class:`~.models.ActivityEvent` by model signals and
+read back with a keyset cursor over ``(created_at, id)``: polling with
+``?after=<cursor>`` is one range scan on that index that returns only what is
+new. As with the catalog change log, events younger than
+``ACTIVITY_SETTLE_SECONDS`` (default 1) are held back, so a transaction that
+commits late cannot slip in behind a cursor a client already holds.
+"""
+import base64
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.timesince import timesince
+
+from .models import ActivityEvent
+
+DEFAULT_SETTLE_SECONDS = 1
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def record_event(type, description, object_id=None):
+    from .live import notify_activity
+
+    event = ActivityEvent.objects.create(type=type, description=description[:255], object_id=object_id)
+    # Live streams in this process pick it up without waiting for their poll.
+    transaction.on_commit(notify_activity)
+    return event
+
+
+def encode_cursor(event):
+    raw = f'{event.created_at.isoformat()}|{event.pk}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    if created_at is None:
+        raise InvalidCursor('Invalid cursor')
+    return created_at, pk
+
+
+def settled_events():
+    settle = getattr(settings, 'ACTIVITY_SETTLE_SECONDS', DEFAULT_SETTLE_SECONDS)
+    return ActivityEvent.objects.filter(created_at__lte=timezone.now() - timedelta(seconds=settle))
+
+
+def latest_events(limit):
+    """``(events newest first, cursor)``: the most recent ``limit`` events."""
+    events = list(settled_events().order_by('-created_at', '-id')[:limit])
+    return events, encode_cursor(events[0]) if events else None
+
+
+def events_after(cursor, limit):
+    """
+    ``(events newest first, cursor, has_more)`` for the oldest ``limit``
+    events after ``cursor``; with ``has_more`` the next poll picks up where
+    this page stopped.
+    """
+    created_at, pk = decode_cursor(cursor)
+    events = list(
+        settled_events()
+        .filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        .order_by('created_at', 'id')[:limit + 1]
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+    next_cursor = encode_cursor(events[-1]) if events else cursor
+    return events[::-1], next_cursor, has_more
+
+
+def prune_events(days=None, batch_size=5000):
+    """Delete events older than ``days`` in batches of ``batch_size`` rows; returns the count."""
+    if days is None:
+        days = getattr(settings, 'ACTIVITY_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(
+            ActivityEvent.objects.filter(created_at__lt=cutoff)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += ActivityEvent.objects.filter(id__in=ids).delete()[0]
+
+
+def serialize_event(event, now=None):
+    now = now or timezone.now()
+    if now - event.created_at < timedelta(minutes=1):
+        ago = 'Just now'
+    else:
+        ago = timesince(event.created_at, now).split(',')[0] + ' ago'
+    return {
+        'id': event.pk,
+        'type': event.type,
+        'icon': event.icon,
+        'description': event.description,
+        'created_at': event.created_at.isoformat(),
+        'time': ago,
+    }
@@ -5,3 +5,6 @@ class AdminDashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.admin_dashboard'
     verbose_name = 'Admin Dashboard'
+
+    def ready(self):
+        import apps.admin_dashboard.signals
@@ -0,0 +1,60 @@
+"""
+Filter-tab counters for the admin order and product lists.
+
+Each set of counts is one ``COUNT(*) FILTER (WHERE ...)`` aggregate instead
+of a query per tab. The unfiltered counts (what the lists show when there is
+no search) are also cached, and ``signals.py`` drops them when an order
+changes status or a product is saved or deleted; ``LIST_COUNTS_TIMEOUT``
+(seconds, default 300) bounds how stale other processes' caches can get.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.orders.models import Order
+from apps.products.models import Product
+
+ORDER_COUNTS_KEY = 'admin-dashboard:order-status-counts'
+PRODUCT_COUNTS_KEY = 'admin-dashboard:product-counts'
+DEFAULT_TIMEOUT = 300
+
+
+def _timeout():
+    return getattr(settings, 'LIST_COUNTS_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def order_status_counts(queryset=None):
+    """``{'all': n, <status>: n, ...}`` for ``queryset`` (default: every order)."""
+    if queryset is None:
+        counts = cache.get(ORDER_COUNTS_KEY)
+        if counts is None:
+            counts = order_status_counts(Order.objects.all())
+            cache.set(ORDER_COUNTS_KEY, counts, _timeout())
+        return counts
+    aggregates = {'all': Count('id')}
+    for status, _ in Order.STATUS_CHOICES:
+        aggregates[status] = Count('id', filter=Q(status=status))
+    return queryset.order_by().aggregate(**aggregates)
+
+
+def product_counts(queryset=None):
+    """Total, available and featured counts for ``queryset`` (default: every product)."""
+    if queryset is None:
+        counts = cache.get(PRODUCT_COUNTS_KEY)
+        if counts is None:
+            counts = product_counts(Product.objects.all())
+            cache.set(PRODUCT_COUNTS_KEY, counts, _timeout())
+        return counts
+    return queryset.order_by().aggregate(
+        total=Count('id'),
+        available=Count('id', filter=Q(is_available=True)),
+        featured=Count('id', filter=Q(is_featured=True)),
+    )
+
+
+def invalidate_order_counts():
+    cache.delete(ORDER_COUNTS_KEY)
+
+
+def invalidate_product_counts():
+    cache.delete(PRODUCT_COUNTS_KEY)
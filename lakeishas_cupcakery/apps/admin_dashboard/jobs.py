@@ -0,0 +1,123 @@
+"""
+Background export jobs.
+
+A request to export a large list only records an :class:`~.models.ExportJob`
+(kind, format and the list's GET filters). ``manage.py run_export_jobs``
+claims queued jobs and runs them in a thread pool: each job rebuilds the list
+view's filtered queryset from the stored filters, streams it through
+:mod:`core.exports` into a file in the private export storage (never under
+``MEDIA_ROOT``, which is public) and records its progress every
+``PROGRESS_EVERY`` rows, which the dashboard polls.
+"""
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.test import RequestFactory
+from django.utils import timezone
+
+from core.exports import FORMATS, STREAMS
+
+from .models import ExportJob
+
+EXPORT_DIR = 'exports'
+PROGRESS_EVERY = 1000
+DEFAULT_STALE_SECONDS = 10 * 60
+DEFAULT_RETENTION_DAYS = 7
+
+
+def export_views():
+    from .views import OrderListView, ProductListView
+    return {
+        ExportJob.KIND_PRODUCTS: ProductListView,
+        ExportJob.KIND_ORDERS: OrderListView,
+    }
+
+
+def enqueue_export(kind, format_type, params, user=None):
+    if kind not in export_views():
+        raise ValueError(f'Unknown export kind: {kind}')
+    if format_type not in FORMATS:
+        raise ValueError(f'Unknown export format: {format_type}')
+    return ExportJob.objects.create(kind=kind, format=format_type, params=params, created_by=user)
+
+
+def claim_next_job():
+    """Mark the oldest queued job running and return it (``None`` if the queue is empty)."""
+    queued = ExportJob.objects.filter(status=ExportJob.QUEUED).order_by('created_at', 'id')
+    for pk in queued.values_list('pk', flat=True)[:10]:
+        # The conditional update is the lock: only one worker can flip it.
+        if ExportJob.objects.filter(pk=pk, status=ExportJob.QUEUED).update(
+            status=ExportJob.RUNNING, started_at=timezone.now(), updated_at=timezone.now()
+        ):
+            return ExportJob.objects.get(pk=pk)
+    return None
+
+
+def requeue_stale_jobs(seconds=None):
+    """Put running jobs whose worker stopped reporting back in the queue."""
+    if seconds is None:
+        seconds = getattr(settings, 'EXPORT_JOB_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+    cutoff = timezone.now() - timedelta(seconds=seconds)
+    return ExportJob.objects.filter(status=ExportJob.RUNNING, updated_at__lt=cutoff).update(
+        status=ExportJob.QUEUED, processed_rows=0, started_at=None
+    )
+
+
+def prune_jobs(days=None):
+    """Delete finished jobs (and their files) older than ``days``."""
+    if days is None:
+        days = getattr(settings, 'EXPORT_JOB_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = timezone.now() - timedelta(days=days)
+    jobs = ExportJob.objects.filter(status__in=(ExportJob.DONE, ExportJob.FAILED), created_at__lt=cutoff)
+    for job in jobs.exclude(file=''):
+        job.file.delete(save=False)
+    deleted, _ = jobs.delete()
+    return deleted
+
+
+def _counted(rows, job):
+    processed = 0
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed, updated_at=timezone.now())
+    job.processed_rows = processed
+
+
+def run_job(job):
+    """Write ``job``'s export to the private export storage and mark it done or failed."""
+    partial = None
+    try:
+        view = export_views()[job.kind]()
+        view.setup(RequestFactory().get('/', job.params))
+        job.total_rows = view.export_total()
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows, updated_at=timezone.now())
+
+        _, extension = FORMATS[job.format]
+        name = f'{EXPORT_DIR}/{job.kind}_export_{job.pk}_{timezone.now():%Y%m%d_%H%M%S}.{extension}'
+        path = job.file.storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + '.part'
+        with open(partial, 'wb') as output:
+            for chunk in STREAMS[job.format](view.export_headers, _counted(view.export_rows(), job)):
+                output.write(chunk)
+        os.replace(partial, path)
+
+        job.file.name = name
+        job.status = ExportJob.DONE
+    except Exception as exc:
+        if partial and os.path.exists(partial):
+            os.unlink(partial)
+        job.status = ExportJob.FAILED
+        job.error = str(exc) or exc.__class__.__name__
+        raise
+    finally:
+        job.finished_at = timezone.now()
+        job.save(update_fields=[
+            'status', 'total_rows', 'processed_rows', 'file', 'error', 'updated_at', 'finished_at'
+        ])
+        close_old_connections()
+    return job
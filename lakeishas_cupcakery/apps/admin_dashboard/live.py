@@ -0,0 +1,204 @@
+"""
+Live dashboard updates over Server-Sent Events.
+
+Each worker process runs one :class:`ActivityNotifier` on its event loop. It
+tails the :class:`~.models.ActivityEvent` log (one indexed cursor query every
+``ACTIVITY_STREAM_POLL_SECONDS``, default 2, no matter how many browsers are
+connected) and copies each new event into every connection's queue, so an
+idle connection costs a queue and a suspended coroutine, not a thread or a
+query. The shared log doubles as the broker between workers: an event written
+by any worker or process reaches every worker's stream on its next poll, and
+a write in the same process wakes the local notifier straight away (see
+:func:`notify_activity`).
+
+The stream only makes sense under ASGI (e.g. ``gunicorn config.asgi:application
+-k uvicorn.workers.UvicornWorker``); under WSGI each connection would pin a
+worker thread, so :class:`ActivityStreamView` answers 501 there and the
+dashboard keeps polling the activity feed.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
+
+from .activity import (
+    DEFAULT_SETTLE_SECONDS, InvalidCursor, encode_cursor, events_after, latest_events, serialize_event,
+)
+from .models import ActivityEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_SECONDS = 2
+KEEPALIVE_SECONDS = 20
+QUEUE_SIZE = 100
+BATCH_SIZE = 100
+RETRY_MS = 3000
+
+# SSE event names; everything else is sent as a generic "activity" event.
+EVENT_NAMES = {
+    ActivityEvent.TYPE_ORDER: 'order',
+    ActivityEvent.TYPE_CONTACT: 'contact',
+}
+
+
+def query(func):
+    """
+    Run ``func`` on the thread pool. The notifier outlives the request that
+    started it, so it cannot use the request's thread-sensitive executor.
+    """
+    def run(*args):
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+def format_event(event):
+    data = json.dumps(serialize_event(event))
+    name = EVENT_NAMES.get(event.type, 'activity')
+    return f'id: {encode_cursor(event)}\nevent: {name}\ndata: {data}\n\n'
+
+
+class ActivityNotifier:
+    def __init__(self):
+        self.subscribers = set()
+        self.loop = None
+        self.task = None
+        self.wakeup = None
+        self.cursor = None
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.loop is not loop:
+            with self.lock:
+                self.loop = loop
+                self.wakeup = asyncio.Event()
+            self.cursor = None
+            self.task = loop.create_task(self.run())
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def wake(self):
+        """Poll soon (callable from any thread, e.g. a signal handler)."""
+        with self.lock:
+            loop, wakeup = self.loop, self.wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        settle = getattr(settings, 'ACTIVITY_SETTLE_SECONDS', DEFAULT_SETTLE_SECONDS)
+        try:
+            # Wait out the settle delay, or the new event is not visible yet.
+            loop.call_soon_threadsafe(loop.call_later, settle, wakeup.set)
+        except RuntimeError:
+            pass
+
+    async def run(self):
+        poll = getattr(settings, 'ACTIVITY_STREAM_POLL_SECONDS', DEFAULT_POLL_SECONDS)
+        started = False
+        while self.subscribers:
+            try:
+                await self.poll(started)
+                started = True
+            except Exception:
+                # Keep the streams open; the next poll retries from the same cursor.
+                logger.exception('Could not read activity events')
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), poll)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def poll(self, started):
+        if self.cursor is None:
+            # Start from the newest event; before that, everything is new.
+            events, self.cursor = await query(latest_events)(1 if not started else BATCH_SIZE)
+            if started:
+                self.publish(events)
+            return
+        has_more = True
+        while has_more:
+            events, self.cursor, has_more = await query(events_after)(self.cursor, BATCH_SIZE)
+            self.publish(events)
+
+    def publish(self, events):
+        # events arrive newest first; streams get them in order.
+        for event in reversed(events):
+            message = format_event(event)
+            for queue in list(self.subscribers):
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # A client that stopped reading is cut off (None ends its
+                    # stream); it reconnects with Last-Event-ID and catches
+                    # up from the log.
+                    self.subscribers.discard(queue)
+                    queue.get_nowait()
+                    queue.put_nowait(None)
+
+
+notifier = ActivityNotifier()
+
+
+def notify_activity():
+    notifier.wake()
+
+
+async def event_stream(queue, backlog):
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        for event in backlog:
+            yield format_event(event)
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle stream.
+                yield f': keepalive {timezone.now():%H:%M:%S}\n\n'
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        notifier.unsubscribe(queue)
+
+
+class ActivityStreamView(View):
+    """
+    ``text/event-stream`` of new orders, contact submissions and other
+    activity events for staff. Reconnecting browsers send ``Last-Event-ID``
+    and first receive what they missed.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        is_staff = await sync_to_async(lambda: request.user.is_authenticated and request.user.is_staff)()
+        if not is_staff:
+            return JsonResponse({'error': 'Staff access required'}, status=403)
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({'error': 'Live updates need the ASGI server; poll the activity feed'}, status=501)
+
+        backlog = []
+        last_id = request.headers.get('Last-Event-ID') or request.GET.get('after')
+        if last_id:
+            try:
+                backlog, _, _ = await sync_to_async(events_after)(last_id, BATCH_SIZE)
+            except InvalidCursor:
+                pass
+        queue = notifier.subscribe()
+        response = StreamingHttpResponse(event_stream(queue, backlog[::-1]), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.admin_dashboard.activity import prune_events
+
+
+class Command(BaseCommand):
+    help = 'Delete activity feed events older than the retention window, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Keep this many days of events (default: ACTIVITY_RETENTION_DAYS or 90)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows deleted per statement (default: 5000)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        deleted = prune_events(options['days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} activity events'))
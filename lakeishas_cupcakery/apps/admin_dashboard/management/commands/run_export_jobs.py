@@ -0,0 +1,59 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.admin_dashboard.jobs import claim_next_job, prune_jobs, requeue_stale_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process queued admin export jobs in a thread pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2,
+                            help='Jobs to run at the same time (default: 2)')
+        parser.add_argument('--poll', type=float, default=2.0,
+                            help='Seconds to wait between checks of an empty queue (default: 2)')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty instead of waiting for new jobs')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs'))
+        pruned = prune_jobs()
+        if pruned:
+            self.stdout.write(f'Pruned {pruned} old jobs')
+
+        running = {}
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='export-job') as pool:
+            try:
+                while True:
+                    while len(running) < options['workers']:
+                        job = claim_next_job()
+                        if job is None:
+                            break
+                        self.stdout.write(f'Started {job}')
+                        running[pool.submit(run_job, job)] = job
+
+                    if not running:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll'])
+                        continue
+
+                    done, _ = wait(running, timeout=options['poll'], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = running.pop(future)
+                        if future.exception() is None:
+                            self.stdout.write(self.style.SUCCESS(f'Finished {job} ({job.processed_rows} rows)'))
+                        else:
+                            logger.error('Export job %s failed', job.pk, exc_info=future.exception())
+                            self.stdout.write(self.style.ERROR(f'Failed {job}: {job.error}'))
+            except KeyboardInterrupt:
+                self.stdout.write('Stopping after the running jobs finish')
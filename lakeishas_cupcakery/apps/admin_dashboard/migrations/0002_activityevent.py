@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('order', 'Order'), ('user', 'User'), ('product', 'Product'), ('review', 'Review'), ('blog', 'Blog')], max_length=10)),
+                ('description', models.CharField(max_length=255)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['created_at', 'id'], name='activityevent_created_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0002_activityevent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activityevent',
+            name='type',
+            field=models.CharField(choices=[('order', 'Order'), ('user', 'User'), ('product', 'Product'), ('review', 'Review'), ('blog', 'Blog'), ('contact', 'Contact')], max_length=10),
+        ),
+    ]
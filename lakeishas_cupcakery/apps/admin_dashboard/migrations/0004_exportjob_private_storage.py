@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:59
+
+import apps.admin_dashboard.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0003_alter_activityevent_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, storage=apps.admin_dashboard.models.export_storage, upload_to='exports/'),
+        ),
+    ]
@@ -0,0 +1,133 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+
+
+class PrivateStorage(FileSystemStorage):
+    """File storage outside ``MEDIA_ROOT`` whose files have no URL."""
+
+    def url(self, name):
+        raise ValueError('Files in private storage have no public URL.')
+
+
+def export_storage():
+    """
+    Storage for export files (``EXPORT_ROOT``, default ``BASE_DIR/private``).
+    Exports hold customer data, so they are only served through the
+    staff-only download view, never ``/media/``.
+    """
+    root = getattr(settings, 'EXPORT_ROOT', None) or os.path.join(settings.BASE_DIR, 'private')
+    return PrivateStorage(location=root)
+
+
+class ExportJob(models.Model):
+    """
+    An admin list export run by ``manage.py run_export_jobs`` instead of in
+    the request, written to :func:`export_storage`.
+    """
+    KIND_PRODUCTS = 'products'
+    KIND_ORDERS = 'orders'
+    KIND_CHOICES = (
+        (KIND_PRODUCTS, 'Products'),
+        (KIND_ORDERS, 'Orders'),
+    )
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10)
+    # The list view's GET filters (search, status, ...) at request time.
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to='exports/', storage=export_storage, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Touched with every progress update; a running job whose heartbeat
+    # stops belonged to a worker that died.
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='exportjob_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} export #{self.pk} ({self.status})'
+
+    @property
+    def percent(self):
+        if self.status == self.DONE:
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.processed_rows * 100 / self.total_rows))
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only log behind the dashboard's activity feed, written by model
+    signals (see ``signals.py``) and read with ``(created_at, id)`` cursors.
+    """
+    TYPE_ORDER = 'order'
+    TYPE_USER = 'user'
+    TYPE_PRODUCT = 'product'
+    TYPE_REVIEW = 'review'
+    TYPE_BLOG = 'blog'
+    TYPE_CONTACT = 'contact'
+    TYPE_CHOICES = (
+        (TYPE_ORDER, 'Order'),
+        (TYPE_USER, 'User'),
+        (TYPE_PRODUCT, 'Product'),
+        (TYPE_REVIEW, 'Review'),
+        (TYPE_BLOG, 'Blog'),
+        (TYPE_CONTACT, 'Contact'),
+    )
+    ICONS = {
+        TYPE_ORDER: 'shopping-cart',
+        TYPE_USER: 'user-plus',
+        TYPE_PRODUCT: 'box',
+        TYPE_REVIEW: 'star',
+        TYPE_BLOG: 'edit',
+        TYPE_CONTACT: 'envelope',
+    }
+
+    type = models.CharField(max_length=10, choices=TYPE_CHOICES)
+    description = models.CharField(max_length=255)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='activityevent_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.description
+
+    @property
+    def icon(self):
+        return self.ICONS.get(self.type, 'bell')
@@ -0,0 +1,69 @@
+"""
+Paginator for the admin lists that avoids an exact ``COUNT(*)`` per page.
+
+On PostgreSQL the row count comes from the planner: ``pg_class.reltuples``
+for an unfiltered list, otherwise the row estimate of ``EXPLAIN``. Only when
+the estimate is below ``ADMIN_ESTIMATED_COUNT_THRESHOLD`` (default 10,000) is
+the exact count run, since it is cheap there and small lists should show exact
+page numbers. Other databases have no usable estimates, so the exact count
+is cached per query for ``ADMIN_COUNT_CACHE_TIMEOUT`` seconds (default 60).
+
+``paginator.is_estimate`` tells templates to label the total as approximate.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+DEFAULT_THRESHOLD = 10000
+DEFAULT_CACHE_TIMEOUT = 60
+CACHE_PREFIX = 'admin-count:'
+
+
+class EstimatedCountPaginator(Paginator):
+    is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if connections[queryset.db].vendor == 'postgresql':
+            estimate = self.estimate_count(queryset)
+            if estimate is not None and estimate >= getattr(
+                settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', DEFAULT_THRESHOLD
+            ):
+                self.is_estimate = True
+                return estimate
+            return queryset.count()
+        return self.cached_count(queryset)
+
+    def estimate_count(self, queryset):
+        """The planner's row estimate, or ``None`` if there is none."""
+        try:
+            if not queryset.query.where and not queryset.query.distinct:
+                with connections[queryset.db].cursor() as cursor:
+                    cursor.execute(
+                        'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                # -1 (or 0 on older servers) until the table is first analyzed.
+                return row[0] if row and row[0] > 0 else None
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except (DatabaseError, ValueError, KeyError, IndexError, TypeError):
+            return None
+
+    def cached_count(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        key = CACHE_PREFIX + hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode('utf-8')).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, getattr(settings, 'ADMIN_COUNT_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+        return count
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.blog.models import BlogComment, BlogPost
+from apps.contact.models import ContactSubmission
+from apps.orders.models import Order
+from apps.products.models import Product
+
+from .activity import record_event
+from .counters import invalidate_order_counts, invalidate_product_counts
+from .models import ActivityEvent
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Order)
+def refresh_order_counts(sender, instance, created=False, **kwargs):
+    # orders/signals.py keeps the pre-save status for the sales rollup.
+    previous = getattr(instance, '_rollup_previous', None)
+    if created or previous is None or previous['status'] != instance.status:
+        invalidate_order_counts()
+
+
+@receiver(post_delete, sender=Order)
+def refresh_order_counts_on_delete(sender, instance, **kwargs):
+    invalidate_order_counts()
+
+
+@receiver([post_save, post_delete], sender=Product)
+def refresh_product_counts(sender, instance, **kwargs):
+    invalidate_product_counts()
+
+
+@receiver(post_save, sender=Order)
+def log_order_activity(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record_event(ActivityEvent.TYPE_ORDER, f'New order #{instance.order_number} from {instance.email}', instance.pk)
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is not None and previous['status'] != instance.status:
+        record_event(
+            ActivityEvent.TYPE_ORDER,
+            f'Order #{instance.order_number} marked {instance.get_status_display().lower()}',
+            instance.pk,
+        )
+
+
+@receiver(post_save, sender=User)
+def log_user_activity(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_event(ActivityEvent.TYPE_USER, f'New user registered: {instance.email}', instance.pk)
+
+
+@receiver(post_save, sender=Product)
+def log_product_activity(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_event(ActivityEvent.TYPE_PRODUCT, f'Product "{instance.name}" added', instance.pk)
+
+
+@receiver(post_delete, sender=Product)
+def log_product_removal(sender, instance, **kwargs):
+    record_event(ActivityEvent.TYPE_PRODUCT, f'Product "{instance.name}" deleted', instance.pk)
+
+
+@receiver(pre_save, sender=BlogPost)
+def remember_post_published(sender, instance, **kwargs):
+    instance._was_published = bool(
+        instance.pk and BlogPost.objects.filter(pk=instance.pk, is_published=True).exists()
+    )
+
+
+@receiver(post_save, sender=BlogPost)
+def log_post_activity(sender, instance, raw=False, **kwargs):
+    if not raw and instance.is_published and not getattr(instance, '_was_published', False):
+        record_event(ActivityEvent.TYPE_BLOG, f'New blog post published: "{instance.title}"', instance.pk)
+
+
+@receiver(post_save, sender=BlogComment)
+def log_comment_activity(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_event(ActivityEvent.TYPE_BLOG, f'New comment on "{instance.post.title}"', instance.pk)
+
+
+@receiver(post_save, sender=ContactSubmission)
+def log_contact_activity(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_event(
+            ActivityEvent.TYPE_CONTACT, f'New message from {instance.name}: "{instance.subject}"', instance.pk
+        )
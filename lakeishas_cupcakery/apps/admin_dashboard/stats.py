@@ -0,0 +1,160 @@
+"""
+KPI snapshot for the admin dashboard.
+
+:func:`collect_dashboard_stats` gathers every figure the dashboard shows with
+conditional aggregation (one query per table instead of one per number),
+reading order figures from the pre-aggregated ``DailySalesRollup``, and
+:func:`get_dashboard_stats` serves it from the cache:
+
+* a snapshot younger than ``DASHBOARD_STATS_TTL`` seconds (default 60) is
+  returned as is;
+* an older one is still returned, while a single background thread
+  recomputes it, so page loads never wait on the aggregates;
+* only when there is no snapshot at all (cold cache, or older than
+  ``DASHBOARD_STATS_MAX_AGE``, default 1 hour) does the request compute it
+  inline.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.orders.models import DailySalesRollup
+from apps.products.models import Category, Product
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'admin-dashboard:stats'
+LOCK_KEY = CACHE_KEY + ':refreshing'
+DEFAULT_TTL = 60
+DEFAULT_MAX_AGE = 60 * 60
+RECENT_DAYS = 7
+REVENUE_DAYS = 180
+TOP_PRODUCTS = 5
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def collect_dashboard_stats():
+    """Compute a fresh snapshot (a plain, picklable dict)."""
+    User = get_user_model()
+    now = timezone.now()
+    week_ago = now - timedelta(days=RECENT_DAYS)
+
+    # Order figures come from the daily rollup's order-level rows
+    # (product=None): a few rows per day instead of every order.
+    today = timezone.localdate(now)
+    week_start = today - timedelta(days=RECENT_DAYS)
+    order_rows = DailySalesRollup.objects.filter(product__isnull=True)
+    recent = Q(date__gte=week_start)
+    orders = order_rows.order_by().aggregate(
+        total_orders=Sum('order_count'),
+        recent_orders_count=Sum('order_count', filter=recent),
+        total_revenue=Sum('revenue'),
+        recent_revenue=Sum('revenue', filter=recent),
+    )
+    customers = User.objects.filter(is_staff=False).order_by().aggregate(
+        total_customers=Count('id'),
+        new_customers=Count('id', filter=Q(date_joined__gte=week_ago)),
+    )
+
+    start = (today - timedelta(days=REVENUE_DAYS)).replace(day=1)
+    monthly = (
+        order_rows.filter(date__gte=start)
+        .annotate(month=TruncMonth('date'))
+        .values('month')
+        .annotate(total=Sum('revenue'))
+        .order_by('month')
+    )
+    categories = (
+        Category.objects.annotate(product_count=Count('products'))
+        .values('name', 'product_count')
+        .order_by('name')
+    )
+    top_products = list(
+        DailySalesRollup.objects.filter(product__isnull=False)
+        .values('product_id')
+        .annotate(sales_count=Sum('quantity'))
+        .filter(sales_count__gt=0)
+        .order_by('-sales_count')[:TOP_PRODUCTS]
+    )
+    products = Product.objects.in_bulk([row['product_id'] for row in top_products])
+
+    return {
+        'generated_at': now,
+        'total_orders': orders['total_orders'] or 0,
+        'recent_orders_count': orders['recent_orders_count'] or 0,
+        'total_revenue': orders['total_revenue'] or 0,
+        'recent_revenue': orders['recent_revenue'] or 0,
+        'total_products': Product.objects.count(),
+        'total_customers': customers['total_customers'],
+        'new_customers': customers['new_customers'],
+        'monthly_revenue': {
+            'labels': [row['month'].strftime('%b %Y') for row in monthly],
+            'data': [float(row['total'] or 0) for row in monthly],
+        },
+        'product_categories': {
+            'labels': [row['name'] for row in categories],
+            'data': [row['product_count'] for row in categories],
+        },
+        'top_products': [
+            {
+                'id': row['product_id'],
+                'name': products[row['product_id']].name,
+                'price': products[row['product_id']].price,
+                'sales_count': row['sales_count'],
+            }
+            for row in top_products
+            if row['product_id'] in products
+        ],
+    }
+
+
+def refresh_dashboard_stats():
+    """Recompute and store the snapshot; returns it."""
+    stats = collect_dashboard_stats()
+    max_age = getattr(settings, 'DASHBOARD_STATS_MAX_AGE', DEFAULT_MAX_AGE)
+    cache.set(CACHE_KEY, (time.time(), stats), max_age)
+    return stats
+
+
+def _refresh_in_background():
+    try:
+        refresh_dashboard_stats()
+    except Exception:
+        logger.exception('Could not refresh dashboard stats')
+    finally:
+        cache.delete(LOCK_KEY)
+        close_old_connections()
+
+
+def _schedule_refresh():
+    global _executor
+    # cache.add is atomic, so only one refresh runs at a time.
+    if not cache.add(LOCK_KEY, True, getattr(settings, 'DASHBOARD_STATS_TTL', DEFAULT_TTL)):
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dashboard-stats')
+    _executor.submit(_refresh_in_background)
+
+
+def get_dashboard_stats():
+    """The current snapshot, refreshed in the background once it is stale."""
+    cached = cache.get(CACHE_KEY)
+    if cached is None:
+        return refresh_dashboard_stats()
+    computed_at, stats = cached
+    if time.time() - computed_at > getattr(settings, 'DASHBOARD_STATS_TTL', DEFAULT_TTL):
+        _schedule_refresh()
+    return stats
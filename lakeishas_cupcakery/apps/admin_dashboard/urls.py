@@ -4,6 +4,7 @@ from django.views.decorators.http import require_POST
 from django.views.generic import RedirectView
 from django.urls import reverse_lazy
 from . import views
+from .live import ActivityStreamView
 from django.contrib import admin
 
 app_name = 'admin_dashboard'
@@ -26,6 +27,12 @@ urlpatterns = [
     # Order Management
     path('orders/', views.OrderListView.as_view(), name='orders'),
     
+    # Background exports
+    path('exports/<str:kind>/', require_POST(views.ExportJobCreateView.as_view()), name='export_create'),
+    path('exports/jobs/<int:pk>/', views.ExportJobStatusView.as_view(), name='export_job'),
+    path('exports/jobs/<int:pk>/progress/', views.ExportJobPageView.as_view(), name='export_job_page'),
+    path('exports/jobs/<int:pk>/download/', views.ExportJobDownloadView.as_view(), name='export_job_download'),
+    
     # Blog Management
     path('blog/', views.PostListView.as_view(), name='blog_list'),
     path('blog/add/', views.PostCreateView.as_view(), name='blog_add'),
@@ -45,4 +52,5 @@ urlpatterns = [
     # Analytics
     path('analytics/', views.AnalyticsView.as_view(), name='analytics'),
     path('analytics/activity/', views.ActivityFeedView.as_view(), name='activity_feed'),
+    path('analytics/activity/stream/', ActivityStreamView.as_view(), name='activity_stream'),
 ]
@@ -22,7 +22,7 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.urls import reverse_lazy, reverse
 from django.views.decorators.http import require_http_methods, require_POST
 from django.utils.decorators import method_decorator
-from django.http import JsonResponse, HttpResponse, HttpResponseRedirect
+from django.http import JsonResponse, HttpResponse, HttpResponseRedirect, FileResponse
 from django.views.decorators.cache import never_cache
 from django.utils.decorators import method_decorator
 from django.conf import settings
@@ -34,16 +34,8 @@ from django.db.models.functions import TruncMonth, ExtractMonth, ExtractYear, Ex
 from django.utils import timezone
 from datetime import datetime, timedelta
 import json
-import csv
 import logging
-from io import BytesIO
-
-try:
-    import xlwt
-    XLS_SUPPORT = True
-except ImportError:
-    XLS_SUPPORT = False
-    logging.warning("xlwt module not found. Excel export will be disabled.")
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +43,33 @@ from apps.products.models import Product, Category
 from apps.orders.models import Order, OrderItem
 from apps.blog.models import BlogPost as Post
 from apps.users.models import User
+from apps.orders.models import DailySalesRollup
+from apps.orders.rollups import REVENUE_STATUSES
+from apps.orders.timeseries import GRANULARITIES, order_series
+from apps.analytics.reports import top_referrers, traffic_series, traffic_sources as analytics_sources
+from core.exports import FORMATS as EXPORT_FORMATS, streaming_export
+from .activity import (
+    DEFAULT_PAGE_SIZE as DEFAULT_ACTIVITY_PAGE_SIZE, MAX_PAGE_SIZE as MAX_ACTIVITY_PAGE_SIZE,
+    InvalidCursor, events_after, latest_events, serialize_event,
+)
+from .counters import order_status_counts, product_counts
+from .jobs import enqueue_export
+from .pagination import EstimatedCountPaginator
+from .models import ExportJob
+from .stats import RECENT_DAYS, get_dashboard_stats
+
+EXPORT_CHUNK_SIZE = 2000
+ANALYTICS_ACTIVITY_COUNT = 5
+# Older links used ?export=xls for the (65,536-row) xlwt workbook.
+EXPORT_ALIASES = {'xls': 'xlsx'}
+EXPORT_CHOICES = [
+    {'name': 'CSV', 'value': 'csv'},
+    {'name': 'Excel', 'value': 'xlsx'},
+    {'name': 'JSON', 'value': 'json'},
+    {'name': 'NDJSON', 'value': 'ndjson'},
+]
+# Exports with more rows than this run as background jobs instead of streaming.
+EXPORT_SYNC_MAX_ROWS = 5000
 
 User = get_user_model()
 
@@ -101,6 +120,17 @@ class AdminBaseView(AdminBaseMixin, TemplateView):
 class AdminListView(AdminBaseMixin, ListView):
     """Base view for admin list views"""
     paginate_by = 15
+    paginator_class = EstimatedCountPaginator
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Page links around the current page, without walking every page number
+        page = context.get('page_obj')
+        if page is not None:
+            context['nearby_pages'] = range(
+                max(1, page.number - 2), min(page.paginator.num_pages, page.number + 2) + 1
+            )
+        return context
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -115,58 +145,6 @@ class AdminDashboardView(AdminBaseView):
     page_title = 'Dashboard'
     section_name = 'dashboard'
     
-    def get_monthly_revenue(self):
-        """Get monthly revenue data for the past 6 months"""
-        today = timezone.now().date()
-        six_months_ago = today - timedelta(days=180)
-        
-        # Get monthly revenue data
-        monthly_data = Order.objects.filter(
-            created_at__date__gte=six_months_ago
-        ).annotate(
-            month=TruncMonth('created_at')
-        ).values('month').annotate(
-            total=Sum('total')
-        ).order_by('month')
-        
-        # Format data for chart
-        labels = []
-        data = []
-        
-        for month in monthly_data:
-            labels.append(month['month'].strftime('%b %Y'))
-            data.append(float(month['total'] or 0))
-            
-        return {
-            'labels': labels,
-            'datasets': [{
-                'label': 'Monthly Revenue',
-                'data': data,
-                'backgroundColor': 'rgba(75, 192, 192, 0.2)',
-                'borderColor': 'rgba(75, 192, 192, 1)',
-                'borderWidth': 1
-            }]
-        }
-        
-    def get_product_categories(self):
-        """Get product category distribution"""
-        categories = Category.objects.annotate(
-            product_count=Count('products')
-        ).values('name', 'product_count')
-        
-        return {
-            'labels': [cat['name'] for cat in categories],
-            'data': [cat['product_count'] for cat in categories]
-        }
-        
-    def get_top_products(self, limit=5):
-        """Get top selling products"""
-        return Product.objects.annotate(
-            total_sold=Sum('order_items__quantity')
-        ).filter(
-            total_sold__gt=0
-        ).order_by('-total_sold')[:limit]
-
     def get_featured_products(self):
         """Get featured products for the dashboard"""
         return Product.objects.filter(
@@ -177,116 +155,20 @@ class AdminDashboardView(AdminBaseView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get recent orders with related user data
-        recent_orders = Order.objects.select_related('user').order_by('-created_at')[:5]
-        
-        # Get featured products
-        featured_products = self.get_featured_products()
-        
-        # Get stats
+        # KPIs and chart data come from a cached snapshot (see stats.py);
+        # only the short "latest" lists are queried live.
+        stats = get_dashboard_stats()
         today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        
-        # Order stats
-        total_orders = Order.objects.count()
-        recent_orders_count = Order.objects.filter(created_at__date__gte=week_ago).count()
-        
-        # Revenue stats
-        total_revenue = Order.objects.aggregate(total=Sum('total'))['total'] or 0
-        recent_revenue = Order.objects.filter(
-            created_at__date__gte=week_ago
-        ).aggregate(total=Sum('total'))['total'] or 0
-        
-        # Product stats
-        total_products = Product.objects.count()
-        
-        # User stats
-        total_customers = User.objects.filter(is_staff=False).count()
-        new_customers = User.objects.filter(
-            date_joined__date__gte=week_ago, 
-            is_staff=False
-        ).count()
-        
-        # Format data for charts
-        monthly_revenue = self.get_monthly_revenue()
-        product_categories = self.get_product_categories()
-        top_products = self.get_top_products()
         
+        context.update(stats)
         context.update({
-            'recent_orders': recent_orders,
-            'total_orders': total_orders,
-            'recent_orders_count': recent_orders_count,
-            'total_revenue': total_revenue,
-            'recent_revenue': recent_revenue,
-            'total_products': total_products,
-            'total_customers': total_customers,
-            'new_customers': new_customers,
+            'recent_orders': Order.objects.select_related('user').order_by('-created_at')[:5],
+            'featured_products': self.get_featured_products(),
             'today': today,
-            'week_ago': week_ago,
-            'monthly_revenue': monthly_revenue,
-            'product_categories': product_categories,
-            'top_products': top_products,
-            'featured_products': featured_products,
+            'week_ago': today - timedelta(days=RECENT_DAYS),
+            'stats_generated_at': stats['generated_at'],
         })
         return context
-        
-    def get_monthly_revenue(self):
-        # Get revenue for the last 6 months
-        six_months_ago = timezone.now() - timedelta(days=180)
-        
-        # Group by month and sum the totals
-        monthly_data = Order.objects.filter(
-            created_at__gte=six_months_ago
-        ).annotate(
-            month=TruncMonth('created_at')
-        ).values('month').annotate(
-            total=Sum('total')
-        ).order_by('month')
-        
-        # Format data for chart
-        labels = []
-        data = []
-        
-        for item in monthly_data:
-            labels.append(item['month'].strftime('%b %Y'))
-            data.append(float(item['total']))
-            
-        return {
-            'labels': labels,
-            'data': data,
-        }
-        
-    def get_product_categories(self):
-        # Get product count by category
-        categories = Category.objects.annotate(
-            product_count=Count('products')
-        ).values('name', 'product_count')
-        
-        # Format data for chart
-        labels = [cat['name'] for cat in categories]
-        data = [cat['product_count'] for cat in categories]
-        
-        return {
-            'labels': labels,
-            'data': data,
-        }
-        
-    def get_top_products(self):
-        # Get top 5 selling products
-        top_products = OrderItem.objects.values(
-            'product__name'
-        ).annotate(
-            total_quantity=Sum('quantity')
-        ).order_by('-total_quantity')[:5]
-        
-        # Format data for chart
-        labels = [item['product__name'] for item in top_products]
-        data = [item['total_quantity'] for item in top_products]
-        
-        return {
-            'labels': labels,
-            'data': data,
-        }
 
 # Product Management Views
 class ProductListView(AdminListView):
@@ -312,7 +194,6 @@ class ProductListView(AdminListView):
             queryset = queryset.filter(
                 Q(name__icontains=search_query) | 
                 Q(description__icontains=search_query) |
-                Q(sku__icontains=search_query) |
                 Q(category__name__icontains=search_query)
             )
         
@@ -369,12 +250,13 @@ class ProductListView(AdminListView):
         context['current_order'] = self.request.GET.get('order_by', 'name')
         
         # Add filter counts
-        context['total_products'] = self.unfiltered_queryset.count()
-        context['available_products'] = self.unfiltered_queryset.filter(is_available=True).count()
-        context['featured_products'] = self.unfiltered_queryset.filter(is_featured=True).count()
+        counts = product_counts()
+        context['total_products'] = counts['total']
+        context['available_products'] = counts['available']
+        context['featured_products'] = counts['featured']
         
         # Add pagination
-        paginator = Paginator(self.object_list, self.paginate_by)
+        paginator = self.get_paginator(self.object_list, self.paginate_by)
         page = self.request.GET.get('page')
         
         try:
@@ -385,15 +267,11 @@ class ProductListView(AdminListView):
             products = paginator.page(paginator.num_pages)
             
         context['products'] = products
+        context['page_obj'] = products
+        context['is_paginated'] = paginator.num_pages > 1
         
         # Add export formats
-        export_formats = [
-            {'name': 'CSV', 'value': 'csv'},
-            {'name': 'JSON', 'value': 'json'},
-        ]
-        if XLS_SUPPORT:
-            export_formats.insert(1, {'name': 'Excel', 'value': 'xls'})
-        context['export_formats'] = export_formats
+        context['export_formats'] = EXPORT_CHOICES
         
         return context
     
@@ -404,87 +282,33 @@ class ProductListView(AdminListView):
             return self.export_products(export_format)
         return super().get(request, *args, **kwargs)
     
-    def export_products(self, format_type):
-        """Export products in the specified format"""
-        queryset = self.get_queryset()
-        
-        # Prepare data
-        data = []
-        for product in queryset:
-            data.append({
-                'Name': product.name,
-                'SKU': product.sku or '',
-                'Category': product.category.name if product.category else '',
-                'Price': str(product.price),
-                'Sale Price': str(product.sale_price) if product.sale_price else '',
-                'Stock Status': 'In Stock' if product.is_available else 'Out of Stock',
-                'Featured': 'Yes' if product.is_featured else 'No',
-                'Description': product.description or '',
-                'Created At': product.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'Updated At': product.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-            })
-        
-        # Handle different export formats
-        if format_type == 'csv':
-            return self.export_to_csv(data)
-        elif format_type == 'xls':
-            if XLS_SUPPORT:
-                return self.export_to_excel(data)
-            else:
-                messages.error(self.request, 'Excel export is not available. Please install the xlwt package.')
-                return HttpResponseRedirect(reverse('admin_dashboard:products'))
-        elif format_type == 'json':
-            return self.export_to_json(data)
-        else:
-            messages.error(self.request, 'Invalid export format')
-            return HttpResponseRedirect(reverse('admin_dashboard:products'))
+    export_headers = [
+        'Name', 'Category', 'Price', 'Stock Status', 'Featured', 'Description', 'Created At', 'Updated At',
+    ]
     
-    def export_to_csv(self, data):
-        """Export data to CSV format"""
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="products_export_{}.csv"'.format(
-            datetime.now().strftime('%Y%m%d_%H%M%S')
+    def export_rows(self):
+        rows = self.get_queryset().values_list(
+            'name', 'category__name', 'price', 'is_available', 'is_featured',
+            'description', 'created_at', 'updated_at',
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        return (
+            (name, category or '', price, 'In Stock' if available else 'Out of Stock',
+             featured, description or '', created_at, updated_at)
+            for name, category, price, available, featured, description, created_at, updated_at in rows
         )
-        
-        if data:
-            writer = csv.DictWriter(response, fieldnames=data[0].keys())
-            writer.writeheader()
-            for row in data:
-                writer.writerow(row)
-        
-        return response
     
-    def export_to_excel(self, data):
-        """Export data to Excel format"""
-        response = HttpResponse(content_type='application/ms-excel')
-        response['Content-Disposition'] = 'attachment; filename="products_export_{}.xls"'.format(
-            datetime.now().strftime('%Y%m%d_%H%M%S')
-        )
-        
-        wb = xlwt.Workbook(encoding='utf-8')
-        ws = wb.add_sheet('Products')
-        
-        # Add headers
-        if data:
-            headers = list(data[0].keys())
-            for col_num, header in enumerate(headers):
-                ws.write(0, col_num, header, xlwt.easyxf('font: bold on'))
-            
-            # Add data rows
-            for row_num, row_data in enumerate(data, 1):
-                for col_num, value in enumerate(row_data.values()):
-                    ws.write(row_num, col_num, value)
-        
-        wb.save(response)
-        return response
+    def export_total(self):
+        return self.get_queryset().count()
     
-    def export_to_json(self, data):
-        """Export data to JSON format"""
-        response = HttpResponse(json.dumps(data, indent=2), content_type='application/json')
-        response['Content-Disposition'] = 'attachment; filename="products_export_{}.json"'.format(
-            datetime.now().strftime('%Y%m%d_%H%M%S')
-        )
-        return response
+    def export_products(self, format_type):
+        """Stream the filtered products in the specified format"""
+        format_type = EXPORT_ALIASES.get(format_type, format_type)
+        if format_type not in EXPORT_FORMATS:
+            messages.error(self.request, 'Invalid export format')
+            return HttpResponseRedirect(reverse('admin_dashboard:products'))
+        if self.export_total() > export_sync_max_rows():
+            return queue_export(self.request, ExportJob.KIND_PRODUCTS, format_type)
+        return streaming_export(format_type, 'products_export', self.export_headers, self.export_rows())
 
 class ProductCreateView(AdminBaseView, CreateView):
     model = Product
@@ -580,7 +404,7 @@ class OrderListView(AdminListView):
     page_title = 'Order Management'
     section_name = 'orders'
     
-    def get_queryset(self):
+    def search_queryset(self):
         queryset = super().get_queryset().select_related('user').order_by('-created_at')
         
         # Search functionality
@@ -589,9 +413,15 @@ class OrderListView(AdminListView):
             queryset = queryset.filter(
                 Q(order_number__icontains=search_query) |
                 Q(user__email__icontains=search_query) |
-                Q(billing_name__icontains=search_query) |
+                Q(user__first_name__icontains=search_query) |
+                Q(user__last_name__icontains=search_query) |
+                Q(email__icontains=search_query) |
                 Q(status__icontains=search_query)
             )
+        return queryset
+    
+    def get_queryset(self):
+        queryset = self.search_queryset()
             
         # Filter by status
         status = self.request.GET.get('status')
@@ -600,27 +430,162 @@ class OrderListView(AdminListView):
             
         return queryset
     
+    export_headers = [
+        'Order Number', 'Created At', 'Status', 'Payment Status', 'Email', 'Phone',
+        'Subtotal', 'Tax', 'Shipping', 'Total', 'Item', 'Unit Price', 'Quantity', 'Line Total',
+    ]
+    
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('export')
+        if export_format:
+            return self.export_orders(export_format)
+        return super().get(request, *args, **kwargs)
+    
+    def export_rows(self):
+        """One row per line item (orders without items get one empty-item row)"""
+        orders = self.get_queryset().select_related(None).only(
+            'order_number', 'created_at', 'status', 'payment_status', 'email', 'phone_number',
+            'subtotal', 'tax', 'shipping_cost', 'total',
+        ).prefetch_related(Prefetch(
+            'items',
+            queryset=OrderItem.objects.only(
+                'order_id', 'product_name', 'product_price', 'quantity', 'subtotal'
+            ).order_by('id'),
+        ))
+        # With chunk_size, iterator() prefetches the items one chunk at a time.
+        for order in orders.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            head = (
+                order.order_number, order.created_at, order.get_status_display(), order.payment_status,
+                order.email, order.phone_number, order.subtotal, order.tax, order.shipping_cost, order.total,
+            )
+            items = order.items.all()
+            if not items:
+                yield head + ('', '', '', '')
+            for item in items:
+                yield head + (item.product_name, item.product_price, item.quantity, item.subtotal)
+    
+    def export_total(self):
+        counts = self.get_queryset().order_by().aggregate(
+            lines=Count('items'), empty=Count('id', filter=Q(items__isnull=True))
+        )
+        return counts['lines'] + counts['empty']
+    
+    def export_orders(self, format_type):
+        """Stream the filtered orders with their items in the specified format"""
+        format_type = EXPORT_ALIASES.get(format_type, format_type)
+        if format_type not in EXPORT_FORMATS:
+            messages.error(self.request, 'Invalid export format')
+            return HttpResponseRedirect(reverse('admin_dashboard:orders'))
+        if self.export_total() > export_sync_max_rows():
+            return queue_export(self.request, ExportJob.KIND_ORDERS, format_type)
+        return streaming_export(format_type, 'orders_export', self.export_headers, self.export_rows())
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Add status counts for filter tabs
-        context['status_counts'] = {
-            'all': self.get_queryset().count(),
-            'pending': self.get_queryset().filter(status='pending').count(),
-            'processing': self.get_queryset().filter(status='processing').count(),
-            'completed': self.get_queryset().filter(status='completed').count(),
-            'cancelled': self.get_queryset().filter(status='cancelled').count(),
-        }
+        # Add status counts for filter tabs (one aggregate; cached when not searching)
+        if self.request.GET.get('q'):
+            context['status_counts'] = order_status_counts(self.search_queryset())
+        else:
+            context['status_counts'] = order_status_counts()
+        context['status_tabs'] = [
+            (value, label, context['status_counts'][value]) for value, label in Order.STATUS_CHOICES
+        ]
         
         # Add current status filter
         context['current_status'] = self.request.GET.get('status', 'all')
         
         # Add search query
         context['search_query'] = self.request.GET.get('q', '')
+        context['export_formats'] = EXPORT_CHOICES
         
         return context
 
 
+def export_sync_max_rows():
+    return getattr(settings, 'ADMIN_EXPORT_SYNC_MAX_ROWS', EXPORT_SYNC_MAX_ROWS)
+
+
+def export_filters(request):
+    """The list filters in ``request.GET``, without paging and export parameters"""
+    params = request.GET.dict()
+    for key in ('export', 'page'):
+        params.pop(key, None)
+    return params
+
+
+def queue_export(request, kind, format_type):
+    """Queue a large ``?export=`` download and send the browser to the job's progress page"""
+    job = enqueue_export(kind, format_type, export_filters(request), user=request.user)
+    messages.info(request, 'This export is large, so it is being prepared in the background.')
+    return HttpResponseRedirect(reverse('admin_dashboard:export_job_page', args=[job.pk]))
+
+
+class ExportJobCreateView(AdminBaseMixin, View):
+    """Queue a background export of a list view with its current filters"""
+    
+    def post(self, request, kind, *args, **kwargs):
+        params = export_filters(request)
+        format_type = request.GET.get('export', 'csv')
+        format_type = EXPORT_ALIASES.get(format_type, format_type)
+        try:
+            job = enqueue_export(kind, format_type, params, user=request.user)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse(export_job_payload(job), status=202)
+
+
+class ExportJobStatusView(AdminBaseMixin, View):
+    """Progress of an export job, polled by the dashboard"""
+    
+    def get(self, request, pk, *args, **kwargs):
+        return JsonResponse(export_job_payload(get_object_or_404(ExportJob, pk=pk)))
+
+
+class ExportJobPageView(AdminBaseView):
+    """Progress bar for one export job; starts the download when the file is ready"""
+    template_name = 'admin/exports/job.html'
+    page_title = 'Export'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        job = get_object_or_404(ExportJob, pk=self.kwargs['pk'])
+        context['job'] = job
+        context['job_payload'] = export_job_payload(job)
+        context['back_url'] = reverse(f'admin_dashboard:{job.kind}')
+        return context
+
+
+class ExportJobDownloadView(AdminBaseMixin, View):
+    """Download the file of a finished export job"""
+    
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(ExportJob, pk=pk, status=ExportJob.DONE)
+        content_type, _ = EXPORT_FORMATS[job.format]
+        return FileResponse(
+            job.file.open('rb'), as_attachment=True,
+            filename=os.path.basename(job.file.name), content_type=content_type,
+        )
+
+
+def export_job_payload(job):
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'format': job.format,
+        'status': job.status,
+        'processed_rows': job.processed_rows,
+        'total_rows': job.total_rows,
+        'percent': job.percent,
+        'error': job.error,
+        'status_url': reverse('admin_dashboard:export_job', args=[job.pk]),
+        'page_url': reverse('admin_dashboard:export_job_page', args=[job.pk]),
+        'download_url': (
+            reverse('admin_dashboard:export_job_download', args=[job.pk]) if job.status == ExportJob.DONE else None
+        ),
+    }
+
+
 class PostListView(AdminListView):
     model = Post
     template_name = 'admin/blog/list.html'
@@ -888,57 +853,43 @@ class AnalyticsView(AdminBaseView, TemplateView):
             except (ValueError, TypeError):
                 pass
         
-        # Generate date range for charts
-        date_range = [(start_date + timedelta(days=x)).strftime('%Y-%m-%d') 
-                     for x in range((end_date - start_date).days + 1)]
-        
-        # Get order data for the date range
-        orders = Order.objects.filter(
-            created_at__date__range=[start_date, end_date],
-            status='completed'
-        ).annotate(date=TruncMonth('created_at')).values('date').annotate(
-            total_orders=Count('id'),
-            total_revenue=Sum('total')
-        ).order_by('date')
-        
-        # Prepare data for charts
-        orders_data = [0] * len(date_range)
-        for i, date in enumerate(date_range):
-            order = next((o for o in orders if o['date'].strftime('%Y-%m-%d') == date), None)
-            if order:
-                orders_data[i] = float(order['total_orders'])
+        # Zero-filled order/revenue series, bucketed by ?granularity=day|week|month
+        granularity = self.request.GET.get('granularity', 'day')
+        if granularity not in GRANULARITIES:
+            granularity = 'day'
+        series = order_series(start_date, end_date, granularity)
+        date_range = series['labels']
+        orders_data = series['orders']
+        revenue_data = [float(amount) for amount in series['revenue']]
+        
+        sales = DailySalesRollup.objects.filter(
+            date__range=[start_date, end_date],
+            status__in=REVENUE_STATUSES
+        )
         
-        # Get traffic data (this would come from your analytics tool in a real app)
-        # For demo purposes, we'll generate some fake data
-        import random
-        visits_data = [random.randint(50, 200) for _ in date_range]
+        # Page views collected by apps.analytics, in the same buckets
+        visits_data = traffic_series(start_date, end_date, granularity)
         
         # Top products
-        top_products = Product.objects.annotate(
-            total_sold=Sum(
-                'order_items__quantity',
-                filter=Q(order_items__order__created_at__date__range=[start_date, end_date])
-            ),
-            total_revenue=Sum(
-                ExpressionWrapper(
-                    F('order_items__product_price') * F('order_items__quantity'),
-                    output_field=DecimalField(max_digits=12, decimal_places=2)
-                ),
-                filter=Q(order_items__order__created_at__date__range=[start_date, end_date])
-            )
+        top_rows = sales.filter(product__isnull=False).values('product_id').annotate(
+            total_sold=Sum('quantity'),
+            total_revenue=Sum('revenue')
         ).filter(total_sold__gt=0).order_by('-total_sold')[:5]
+        products = Product.objects.select_related('category').in_bulk(
+            [row['product_id'] for row in top_rows]
+        )
+        top_products = []
+        for row in top_rows:
+            product = products.get(row['product_id'])
+            if product is not None:
+                product.total_sold = row['total_sold']
+                product.total_revenue = row['total_revenue']
+                top_products.append(product)
         
-        # Traffic sources (demo data)
-        traffic_sources = {
-            'labels': ['Direct', 'Organic Search', 'Social', 'Email', 'Referral'],
-            'data': [35, 40, 15, 5, 5]
-        }
+        traffic_sources = analytics_sources(start_date, end_date)
+        referrers = top_referrers(start_date, end_date)
         
-        # Referrers data
-        referrers = {
-            'labels': ['google.com', 'facebook.com', 'instagram.com', 'pinterest.com', 'twitter.com'],
-            'data': [150, 85, 120, 60, 40]
-        }
+        activity, activity_cursor = latest_events(ANALYTICS_ACTIVITY_COUNT)
         
         # Update context with all the data
         context.update({
@@ -947,43 +898,21 @@ class AnalyticsView(AdminBaseView, TemplateView):
             'date_range': json.dumps(date_range),
             'visits_data': json.dumps(visits_data),
             'orders_data': json.dumps(orders_data),
+            'revenue_data': json.dumps(revenue_data),
+            'granularity': granularity,
             'top_products': top_products,
             'traffic_sources': traffic_sources,
             'referrers': referrers,
             'total_visits': sum(visits_data),
             'total_orders': sum(orders_data),
-            'total_revenue': sum(order['total_revenue'] or 0 for order in orders),
+            'total_revenue': sum(series['revenue']),
             'conversion_rate': round((sum(orders_data) / sum(visits_data)) * 100, 1) if sum(visits_data) > 0 else 0,
             'visit_change': 12.5,  # Example change percentage
             'order_change': 8.2,   # Example change percentage
             'revenue_change': 15.7, # Example change percentage
             'conversion_change': 3.2, # Example change percentage
-            'recent_activity': [
-                {
-                    'type': 'order',
-                    'icon': 'shopping-cart',
-                    'description': 'New order #1234 from John Doe',
-                    'time': '2 hours ago'
-                },
-                {
-                    'type': 'user',
-                    'icon': 'user-plus',
-                    'description': 'New user registered: jane@example.com',
-                    'time': '5 hours ago'
-                },
-                {
-                    'type': 'product',
-                    'icon': 'box',
-                    'description': 'Product \"Chocolate Cupcake\" is low in stock',
-                    'time': '1 day ago'
-                },
-                {
-                    'type': 'blog',
-                    'icon': 'edit',
-                    'description': 'New blog post published: \"10 Tips for Perfect Cupcakes\"',
-                    'time': '2 days ago'
-                },
-            ]
+            'recent_activity': [serialize_event(event) for event in activity],
+            'activity_cursor': activity_cursor or '',
         })
         
         return context
@@ -991,30 +920,9 @@ class AnalyticsView(AdminBaseView, TemplateView):
     def post(self, request, *args, **kwargs):
         # Handle AJAX request for activity feed refresh
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
-            import random
-            from django.http import JsonResponse
-            
-            activities = [
-                {
-                    'type': 'order',
-                    'icon': 'shopping-cart',
-                    'description': f'New order #{random.randint(1000, 9999)} from Customer',
-                    'time': 'Just now'
-                },
-                {
-                    'type': 'user',
-                    'icon': 'user-plus',
-                    'description': f'New user registered: user{random.randint(100,999)}@example.com',
-                    'time': '5 minutes ago'
-                },
-                {
-                    'type': 'product',
-                    'icon': 'box',
-                    'description': 'Product inventory updated',
-                    'time': '30 minutes ago'
-                },
-            ]
-            return JsonResponse({'activities': activities})
+            events, _ = latest_events(ANALYTICS_ACTIVITY_COUNT)
+            now = timezone.now()
+            return JsonResponse({'activities': [serialize_event(event, now) for event in events]})
         return JsonResponse({'error': 'Invalid request'}, status=400)
 
 class SettingsExportView(AdminBaseMixin, View):
@@ -1153,94 +1061,36 @@ class SettingsActionView(AdminBaseView, View):
         return redirect('admin_dashboard:settings')
 
 
-class ActivityFeedView(View):
-    """API endpoint for loading activity feed data"""
+class ActivityFeedView(AdminBaseMixin, View):
+    """
+    Activity feed for the dashboard. Without ``after`` it returns the latest
+    events; with ``?after=<cursor>`` only events newer than the cursor.
+    """
     
     def get(self, request, *args, **kwargs):
-        # In a real app, you would fetch actual activity data from your database
-        import random
-        from django.utils import timezone
-        from datetime import timedelta
+        try:
+            limit = min(int(request.GET.get('limit', DEFAULT_ACTIVITY_PAGE_SIZE)), MAX_ACTIVITY_PAGE_SIZE)
+        except ValueError:
+            return JsonResponse({'error': 'limit must be an integer'}, status=400)
+        if limit < 1:
+            return JsonResponse({'error': 'limit must be positive'}, status=400)
+        
+        after = request.GET.get('after')
+        has_more = False
+        if after:
+            try:
+                events, cursor, has_more = events_after(after, limit)
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+        else:
+            events, cursor = latest_events(limit)
         
-        activities = []
         now = timezone.now()
-        
-        # Generate some sample activities
-        activity_types = [
-            {'type': 'order', 'icon': 'shopping-cart', 'description': 'New order #{n} from {name}'},
-            {'type': 'user', 'icon': 'user-plus', 'description': 'New user registered: {email}'},
-            {'type': 'product', 'icon': 'box', 'description': 'Product "{product}" is low in stock'},
-            {'type': 'blog', 'icon': 'edit', 'description': 'New blog post published: "{title}"'},
-            {'type': 'review', 'icon': 'star', 'description': 'New {rating}-star review for "{product}"'},
-        ]
-        
-        # Generate random activities
-        for i in range(10):
-            activity = random.choice(activity_types).copy()
-            time_ago = now - timedelta(
-                hours=random.randint(0, 23),
-                minutes=random.randint(0, 59),
-                seconds=random.randint(0, 59)
-            )
-            
-            # Replace placeholders with random data
-            if '{n}' in activity['description']:
-                activity['description'] = activity['description'].replace('{n}', str(random.randint(1000, 9999)))
-            if '{name}' in activity['description']:
-                names = ['John Doe', 'Jane Smith', 'Robert Johnson', 'Emily Davis', 'Michael Brown']
-                activity['description'] = activity['description'].replace('{name}', random.choice(names))
-            if '{email}' in activity['description']:
-                domains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'example.com']
-                activity['description'] = activity['description'].replace('{email}', f'user{random.randint(100,999)}@{random.choice(domains)}')
-            if '{product}' in activity['description']:
-                products = ['Chocolate Cupcake', 'Vanilla Cupcake', 'Red Velvet', 'Carrot Cake', 'Lemon Drizzle']
-                activity['description'] = activity['description'].replace('{product}', random.choice(products))
-            if '{title}' in activity['description']:
-                titles = [
-                    '10 Tips for Perfect Cupcakes',
-                    'The History of Cupcakes',
-                    'Gluten-Free Baking Guide',
-                    'Seasonal Flavors for Fall',
-                    'Decorating Ideas for Beginners'
-                ]
-                activity['description'] = activity['description'].replace('{title}', random.choice(titles))
-            if '{rating}' in activity['description']:
-                activity['description'] = activity['description'].replace('{rating}', str(random.randint(1, 5)))
-            
-            activities.append({
-                'type': activity['type'],
-                'icon': activity['icon'],
-                'description': activity['description'],
-                'time': time_ago
-            })
-        
-        # Sort by time (newest first)
-        activities.sort(key=lambda x: x['time'], reverse=True)
-        
-        # Format times as "X time ago"
-        for activity in activities:
-            delta = now - activity['time']
-            if delta.days > 0:
-                if delta.days == 1:
-                    activity['time'] = '1 day ago'
-                else:
-                    activity['time'] = f'{delta.days} days ago'
-            elif delta.seconds >= 3600:
-                hours = delta.seconds // 3600
-                if hours == 1:
-                    activity['time'] = '1 hour ago'
-                else:
-                    activity['time'] = f'{hours} hours ago'
-            elif delta.seconds >= 60:
-                minutes = delta.seconds // 60
-                if minutes == 1:
-                    activity['time'] = '1 minute ago'
-                else:
-                    activity['time'] = f'{minutes} minutes ago'
-            else:
-                activity['time'] = 'Just now'
-        
-        return JsonResponse({'activities': activities[:5]})
+        return JsonResponse({
+            'activities': [serialize_event(event, now) for event in events],
+            'cursor': cursor,
+            'has_more': has_more,
+        })
 
 
 class WelcomeView(TemplateView):
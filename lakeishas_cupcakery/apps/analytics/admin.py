@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import DailyTraffic, PageView
+
+
+@admin.register(PageView)
+class PageViewAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'path', 'source', 'referrer')
+    list_filter = ('source',)
+    search_fields = ('path', 'referrer')
+    date_hierarchy = 'created_at'
+
+
+@admin.register(DailyTraffic)
+class DailyTrafficAdmin(admin.ModelAdmin):
+    list_display = ('date', 'source', 'referrer', 'views')
+    list_filter = ('source',)
+    date_hierarchy = 'date'
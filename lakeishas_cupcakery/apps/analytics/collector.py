@@ -0,0 +1,178 @@
+"""
+In-process page-view collection.
+
+:func:`record_hit` (called by the middleware and the ``/api/analytics/hit/``
+endpoint) only appends a tuple to a per-process buffer, so recording costs
+the request microseconds and no query. A daemon thread writes the buffer
+out when it reaches ``PAGE_VIEW_BUFFER_SIZE`` hits (default 500) or every
+``PAGE_VIEW_FLUSH_SECONDS`` (default 5), whichever comes first: one
+``bulk_create`` of :class:`~.models.PageView` rows plus one ``UPDATE`` per
+touched (day, source, referrer) row of :class:`~.models.DailyTraffic`, in one
+transaction.
+
+Hits still buffered when a worker is killed are lost; the buffer is flushed
+at interpreter exit, which covers normal restarts.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyTraffic, PageView
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 500
+DEFAULT_FLUSH_SECONDS = 5
+# Cap on buffered hits if the database is unreachable, so memory stays bounded.
+MAX_PENDING = 100000
+
+# Matched against every label of the referrer host but the TLD.
+SEARCH_ENGINES = {'google', 'bing', 'duckduckgo', 'yahoo', 'yandex', 'baidu', 'ecosia'}
+SOCIAL_SITES = {'facebook', 'instagram', 'twitter', 'pinterest', 'tiktok', 'linkedin', 'reddit', 'youtube'}
+SOCIAL_HOSTS = {'x.com', 't.co', 'fb.me', 'lnkd.in'}
+
+
+def referrer_host(referrer):
+    try:
+        host = urlsplit(referrer or '').hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def classify(url, referrer, own_hosts=()):
+    """Return ``(source, referrer host)`` for a hit on ``url`` from ``referrer``."""
+    query = parse_qs(urlsplit(url or '').query)
+    medium = (query.get('utm_medium') or [''])[0].lower()
+    host = referrer_host(referrer)
+    if host in own_hosts:
+        host = ''
+    if medium == 'email':
+        return PageView.SOURCE_EMAIL, host
+    if not host:
+        return PageView.SOURCE_DIRECT, ''
+    labels = set(host.split('.')[:-1])
+    if labels & SEARCH_ENGINES:
+        return PageView.SOURCE_SEARCH, host
+    if host in SOCIAL_HOSTS or labels & SOCIAL_SITES:
+        return PageView.SOURCE_SOCIAL, host
+    return PageView.SOURCE_REFERRAL, host
+
+
+class PageViewBuffer:
+    def __init__(self, size=None, interval=None):
+        self.size = size or getattr(settings, 'PAGE_VIEW_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+        self.interval = interval or getattr(settings, 'PAGE_VIEW_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS)
+        self.hits = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def add(self, hit):
+        with self.lock:
+            if len(self.hits) >= MAX_PENDING:
+                return
+            self.hits.append(hit)
+            full = len(self.hits) >= self.size
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='page-view-flush', daemon=True)
+                self.thread.start()
+        if full:
+            self.wake.set()
+
+    def take(self):
+        with self.lock:
+            hits, self.hits = self.hits, []
+        return hits
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Could not write page views')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        # The background thread and atexit may both flush; one at a time.
+        with self.flush_lock:
+            hits = self.take()
+            if not hits:
+                return 0
+            try:
+                write_hits(hits)
+            except Exception:
+                with self.lock:
+                    self.hits[:0] = hits[:MAX_PENDING - len(self.hits)]
+                raise
+            return len(hits)
+
+
+def write_hits(hits):
+    """Store ``[(created_at, path, source, referrer), ...]`` and add them to the rollup."""
+    totals = Counter((timezone.localdate(created_at), source, referrer) for created_at, _, source, referrer in hits)
+    with transaction.atomic():
+        PageView.objects.bulk_create(
+            [PageView(created_at=created_at, path=path, source=source, referrer=referrer)
+             for created_at, path, source, referrer in hits],
+            batch_size=1000,
+        )
+        for (date, source, referrer), views in totals.items():
+            add_views(date, source, referrer, views)
+
+
+def add_views(date, source, referrer, views):
+    rows = DailyTraffic.objects.filter(date=date, source=source, referrer=referrer)
+    if rows.update(views=F('views') + views):
+        return
+    try:
+        with transaction.atomic():
+            DailyTraffic.objects.create(date=date, source=source, referrer=referrer, views=views)
+    except IntegrityError:
+        # Another worker created the row first.
+        rows.update(views=F('views') + views)
+
+
+@transaction.atomic
+def rebuild(start, end):
+    """Recompute :class:`DailyTraffic` for ``start``..``end`` from the stored page views."""
+    from apps.orders.rollups import day_bounds
+
+    since, until = day_bounds(start, end)
+    DailyTraffic.objects.filter(date__range=(start, end)).delete()
+    rows = [
+        DailyTraffic(date=row['day'], source=row['source'], referrer=row['referrer'], views=row['views'])
+        for row in PageView.objects.filter(created_at__gte=since, created_at__lt=until)
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'source', 'referrer')
+        .annotate(views=Count('id'))
+        .order_by()
+    ]
+    DailyTraffic.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+buffer = PageViewBuffer()
+atexit.register(buffer.flush)
+
+
+def record_hit(path, url='', referrer='', own_hosts=()):
+    source, host = classify(url, referrer, own_hosts)
+    buffer.add((timezone.now(), path[:255], source, host[:100]))
+
+
+def flush():
+    """Write out everything buffered in this process now."""
+    return buffer.flush()
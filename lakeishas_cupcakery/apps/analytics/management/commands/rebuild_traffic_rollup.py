@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.analytics.collector import rebuild
+from apps.analytics.models import PageView
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily traffic rollup from stored page views (default: all page views)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat,
+                            help='First day to rebuild, YYYY-MM-DD (default: first page view)')
+        parser.add_argument('--end', type=date.fromisoformat,
+                            help='Last day to rebuild, YYYY-MM-DD (default: today)')
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if start is None:
+            first = PageView.objects.aggregate(first=Min('created_at'))['first']
+            if first is None:
+                self.stdout.write(self.style.WARNING('No page views to roll up.'))
+                return
+            start = timezone.localdate(first)
+        if end is None:
+            last = PageView.objects.aggregate(last=Max('created_at'))['last']
+            end = max(timezone.localdate(), timezone.localdate(last) if last else start)
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        rows = rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} traffic rows for {start} to {end}'))
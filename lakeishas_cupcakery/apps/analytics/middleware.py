@@ -0,0 +1,50 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .collector import record_hit
+
+DEFAULT_IGNORE_PREFIXES = ('/api/', '/admin/', '/static/', '/media/', '/__debug__/', '/health/')
+
+
+class PageViewMiddleware:
+    """
+    Count successful HTML page loads served by Django. The SPA reports its
+    client-side navigations through ``/api/analytics/hit/`` instead.
+
+    Works in both sync and async stacks; ``record_hit`` only appends to an
+    in-memory buffer, so the async path never needs a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.ignore = tuple(getattr(settings, 'PAGE_VIEW_IGNORE_PREFIXES', DEFAULT_IGNORE_PREFIXES))
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.record(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.record(request, response)
+        return response
+
+    def record(self, request, response):
+        if (
+            request.method == 'GET'
+            and response.status_code == 200
+            and not request.path.startswith(self.ignore)
+            and response.get('Content-Type', '').startswith('text/html')
+        ):
+            record_hit(
+                request.path,
+                url=request.get_full_path(),
+                referrer=request.META.get('HTTP_REFERER', ''),
+                own_hosts=(request.get_host().split(':')[0],),
+            )
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTraffic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('source', models.CharField(choices=[('direct', 'Direct'), ('search', 'Organic Search'), ('social', 'Social'), ('email', 'Email'), ('referral', 'Referral')], max_length=10)),
+                ('referrer', models.CharField(blank=True, max_length=100)),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PageView',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('path', models.CharField(max_length=255)),
+                ('source', models.CharField(choices=[('direct', 'Direct'), ('search', 'Organic Search'), ('social', 'Social'), ('email', 'Email'), ('referral', 'Referral')], max_length=10)),
+                ('referrer', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailytraffic',
+            constraint=models.UniqueConstraint(fields=('date', 'source', 'referrer'), name='dailytraffic_unique_bucket'),
+        ),
+    ]
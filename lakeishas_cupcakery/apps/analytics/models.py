@@ -0,0 +1,49 @@
+from django.db import models
+
+
+class PageView(models.Model):
+    """One storefront page view, written in batches by ``collector.py``."""
+    SOURCE_DIRECT = 'direct'
+    SOURCE_SEARCH = 'search'
+    SOURCE_SOCIAL = 'social'
+    SOURCE_EMAIL = 'email'
+    SOURCE_REFERRAL = 'referral'
+    SOURCE_CHOICES = (
+        (SOURCE_DIRECT, 'Direct'),
+        (SOURCE_SEARCH, 'Organic Search'),
+        (SOURCE_SOCIAL, 'Social'),
+        (SOURCE_EMAIL, 'Email'),
+        (SOURCE_REFERRAL, 'Referral'),
+    )
+
+    created_at = models.DateTimeField(db_index=True)
+    path = models.CharField(max_length=255)
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    # Host only (e.g. google.com); empty for direct visits.
+    referrer = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.path} ({self.created_at:%Y-%m-%d %H:%M})'
+
+
+class DailyTraffic(models.Model):
+    """
+    Page views per day, source and referrer host, kept current by every
+    buffer flush; the analytics dashboard reads this instead of ``PageView``.
+    """
+    date = models.DateField()
+    source = models.CharField(max_length=10, choices=PageView.SOURCE_CHOICES)
+    referrer = models.CharField(max_length=100, blank=True)
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'source', 'referrer'], name='dailytraffic_unique_bucket'),
+        ]
+
+    def __str__(self):
+        return f'{self.date} {self.source} {self.referrer or "-"}: {self.views}'
@@ -0,0 +1,49 @@
+"""Traffic figures for the analytics dashboard, read from ``DailyTraffic``."""
+from django.db.models import Sum
+
+from apps.orders.timeseries import bucket_start, buckets
+
+from .models import DailyTraffic, PageView
+
+TOP_REFERRERS = 5
+
+
+def traffic_series(start, end, granularity='day'):
+    """Page views per bucket, aligned with :func:`apps.orders.timeseries.order_series`."""
+    views = {bucket: 0 for bucket, _, _ in buckets(start, end, granularity)}
+    daily = (
+        DailyTraffic.objects.filter(date__range=(start, end))
+        .values('date')
+        .annotate(total=Sum('views'))
+        .order_by()
+    )
+    for row in daily:
+        views[bucket_start(row['date'], granularity)] += row['total']
+    return list(views.values())
+
+
+def traffic_sources(start, end):
+    totals = dict(
+        DailyTraffic.objects.filter(date__range=(start, end))
+        .values_list('source')
+        .annotate(total=Sum('views'))
+        .order_by()
+    )
+    return {
+        'labels': [label for _, label in PageView.SOURCE_CHOICES],
+        'data': [totals.get(source, 0) for source, _ in PageView.SOURCE_CHOICES],
+    }
+
+
+def top_referrers(start, end, limit=TOP_REFERRERS):
+    rows = (
+        DailyTraffic.objects.filter(date__range=(start, end))
+        .exclude(referrer='')
+        .values('referrer')
+        .annotate(total=Sum('views'))
+        .order_by('-total', 'referrer')[:limit]
+    )
+    return {
+        'labels': [row['referrer'] for row in rows],
+        'data': [row['total'] for row in rows],
+    }
@@ -0,0 +1,47 @@
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.throttling import AnonRateThrottle
+from rest_framework.views import APIView
+
+from .collector import record_hit
+
+DEFAULT_THROTTLE_RATE = '60/min'
+
+
+class PageViewThrottle(AnonRateThrottle):
+    """Per-IP limit on reported page views (``PAGE_VIEW_THROTTLE_RATE``)."""
+    scope = 'page_views'
+
+    def get_rate(self):
+        return getattr(settings, 'PAGE_VIEW_THROTTLE_RATE', DEFAULT_THROTTLE_RATE)
+
+
+class PageViewHitView(APIView):
+    """
+    ``POST {"url": ..., "referrer": ...}`` for each SPA page view (works
+    with ``navigator.sendBeacon``). The hit is buffered, never written in the
+    request, so an accepted hit answers 204 immediately. The endpoint is
+    anonymous, so it is throttled per IP and a ``url`` whose path does not
+    start with ``/`` is rejected with 400.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = [PageViewThrottle]
+
+    def post(self, request, *args, **kwargs):
+        data = request.data if hasattr(request.data, 'get') else {}
+        url = str(data.get('url') or '')[:2000]
+        try:
+            path = urlsplit(url).path
+        except ValueError:
+            path = ''
+        if not path.startswith('/'):
+            return HttpResponse(status=400)
+        own_hosts = tuple(
+            urlsplit(origin).hostname for origin in filter(None, [request.headers.get('Origin')])
+        )
+        record_hit(path, url=url, referrer=str(data.get('referrer') or '')[:2000], own_hosts=own_hosts)
+        return HttpResponse(status=204)
@@ -2,6 +2,8 @@
 from rest_framework import serializers
 from .models import BlogCategory, BlogPost, BlogComment
 from django.contrib.auth import get_user_model
+from core.images import ImageVariantsField
+from core.mixins import SparseFieldsetSerializerMixin
 
 User = get_user_model()
 
@@ -17,20 +19,30 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'description', 'is_active']
         read_only_fields = ['slug']
 
-class BlogPostListSerializer(serializers.ModelSerializer):
+class BlogPostListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     categories = BlogCategorySerializer(many=True, read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='featured_image')
     comment_count = serializers.SerializerMethodField()
+    # The SPA reads the publish date as published_at.
+    published_at = serializers.DateTimeField(source='published_date', read_only=True)
     
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'excerpt', 'author', 'categories',
-            'featured_image', 'image_url', 'status', 'is_featured',
+            'featured_image', 'image_url', 'image_variants', 'is_published',
             'published_at', 'created_at', 'updated_at', 'comment_count'
         ]
-        read_only_fields = ['slug', 'created_at', 'updated_at', 'published_at']
+        read_only_fields = ['slug', 'created_at', 'updated_at']
+
+    collapsed_fields = {
+        'author': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+        'categories': lambda: serializers.PrimaryKeyRelatedField(many=True, read_only=True),
+    }
+    # comment_count runs its own COUNT query and needs no columns.
+    method_field_sources = {'image_url': ('featured_image',), 'comment_count': ()}
     
     def get_image_url(self, obj):
         if obj.featured_image:
@@ -40,6 +52,25 @@ class BlogPostListSerializer(serializers.ModelSerializer):
     def get_comment_count(self, obj):
         return obj.comments.count()
 
+class BlogPostSummarySerializer(serializers.ModelSerializer):
+    """Compact, public card for a published post (used by the home bundle)."""
+    categories = BlogCategorySerializer(many=True, read_only=True)
+    image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='featured_image')
+
+    class Meta:
+        model = BlogPost
+        fields = [
+            'id', 'title', 'slug', 'excerpt', 'categories',
+            'image_url', 'image_variants', 'published_date'
+        ]
+        read_only_fields = fields
+
+    def get_image_url(self, obj):
+        if obj.featured_image:
+            return self.context['request'].build_absolute_uri(obj.featured_image.url)
+        return None
+
 class BlogPostDetailSerializer(BlogPostListSerializer):
     content = serializers.CharField()
     
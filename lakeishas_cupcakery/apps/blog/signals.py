@@ -1,7 +1,12 @@
 # lakeishas_cupcakery/apps/blog/signals.py
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
-from .models import BlogPost
+from core.home import invalidate_home_bundle_on_change
+from core.images import register_image_derivatives
+from .models import BlogCategory, BlogPost
+
+register_image_derivatives(BlogPost, 'featured_image')
+invalidate_home_bundle_on_change(BlogPost, BlogCategory)
 
 @receiver(pre_save, sender=BlogPost)
 def update_blog_post_slug(sender, instance, **kwargs):
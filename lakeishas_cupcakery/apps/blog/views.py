@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from core.mixins import ConditionalGetMixin, SparseFieldsetMixin
 from .models import BlogCategory, BlogPost, BlogComment
 from .serializers import (
     BlogCategorySerializer, 
@@ -13,7 +14,7 @@ from .serializers import (
     BlogCommentSerializer
 )
 
-class BlogCategoryViewSet(viewsets.ModelViewSet):
+class BlogCategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = BlogCategory.objects.filter(is_active=True)
     serializer_class = BlogCategorySerializer
     lookup_field = 'slug'
@@ -27,12 +28,16 @@ class BlogCategoryViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]
         return [AllowAny()]
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+class BlogPostViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'excerpt', 'content', 'author__username']
-    ordering_fields = ['published_at', 'created_at', 'updated_at', 'title']
-    ordering = ['-published_at', '-created_at']
+    ordering_fields = ['published_date', 'created_at', 'updated_at', 'title']
+    ordering = ['-published_date', '-created_at']
+    # User has no updated_at; its last_login is auto_now, so every save bumps it.
+    related_last_modified_fields = ('categories__updated_at', 'author__last_login', 'comments__updated_at')
+    # comment_count counts every comment on the post.
+    related_count_fields = ('comments',)
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -44,7 +49,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         
         # For non-admin users, only show published posts
         if not self.request.user.is_staff:
-            queryset = queryset.filter(status=BlogPost.STATUS_PUBLISHED)
+            queryset = queryset.filter(is_published=True)
         
         # Filter by category slug if provided
         category_slug = self.request.query_params.get('category')
@@ -0,0 +1,130 @@
+"""
+Checkout: turn a whole cart into an :class:`~.models.Order` in one transaction.
+
+The cart's products are fetched with one ``in_bulk`` query and checked
+(available, price unchanged), totals are computed in one pass, and the order
+is written with one ``INSERT`` plus one ``bulk_create`` for its line items,
+instead of ``OrderItem.save`` re-saving the order after every item.
+``bulk_create`` skips the item signals, so the items are added to the sales
+rollup here (:func:`~.rollups.add_items`), in the same transaction.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.products.models import Product
+
+from . import rollups
+from .models import Order, OrderItem
+
+DEFAULT_TAX_RATE = '0'
+DEFAULT_SHIPPING_COST = '0'
+CENT = Decimal('0.01')
+
+
+class CheckoutError(ValueError):
+    """The cart cannot be ordered; ``errors`` maps field names to messages."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def money(amount):
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def merge_lines(items):
+    """
+    ``{product_id: (quantity, expected price or None)}``, adding up repeated
+    products; raises :class:`CheckoutError` when a repeated product is sent
+    with two different expected prices.
+    """
+    lines = {}
+    conflicts = []
+    for item in items:
+        product_id = item['product']
+        quantity, price = lines.get(product_id, (0, None))
+        if 'price' in item:
+            if price is not None and item['price'] != price and product_id not in conflicts:
+                conflicts.append(product_id)
+            price = item['price']
+        lines[product_id] = (quantity + item['quantity'], price)
+    if conflicts:
+        raise CheckoutError({'items': [
+            f'Product {product_id} is listed more than once with different prices.' for product_id in conflicts
+        ]})
+    return lines
+
+
+def price_cart(lines):
+    """
+    Fetch the cart's products in one query and return ``(order items,
+    subtotal)``; raises :class:`CheckoutError` for missing, unavailable or
+    repriced products.
+    """
+    products = Product.objects.only('id', 'name', 'price', 'is_available').in_bulk(list(lines))
+    errors = []
+    items = []
+    subtotal = Decimal('0')
+    for product_id, (quantity, expected) in lines.items():
+        product = products.get(product_id)
+        if product is None or not product.is_available:
+            errors.append(f'Product {product_id} is not available.')
+            continue
+        if expected is not None and expected != product.price:
+            errors.append(f'The price of "{product.name}" changed to {product.price}.')
+            continue
+        line_total = product.price * quantity
+        subtotal += line_total
+        items.append(OrderItem(
+            product=product, product_name=product.name, product_price=product.price,
+            quantity=quantity, subtotal=line_total,
+        ))
+    if errors:
+        raise CheckoutError({'items': errors})
+    return items, subtotal
+
+
+def place_order(user, data):
+    """
+    Create and return the order for validated checkout ``data`` (see
+    ``CheckoutSerializer``); its items are available as ``order.items.all()``
+    without another query.
+    """
+    items, subtotal = price_cart(merge_lines(data['items']))
+    tax_rate = Decimal(getattr(settings, 'ORDER_TAX_RATE', DEFAULT_TAX_RATE))
+    tax = money(subtotal * tax_rate)
+    shipping_cost = money(Decimal(getattr(settings, 'ORDER_SHIPPING_COST', DEFAULT_SHIPPING_COST)))
+
+    if user is not None and not user.is_authenticated:
+        user = None
+    order = Order(
+        user=user,
+        email=data.get('email') or user.email,
+        phone_number=data['phone_number'],
+        shipping_address=data['shipping_address'],
+        billing_address=data.get('billing_address') or data['shipping_address'],
+        notes=data.get('notes') or None,
+        payment_method=data['payment_method'],
+        subtotal=money(subtotal),
+        item_count=sum(item.quantity for item in items),
+        items_subtotal=subtotal,
+        tax=tax,
+        shipping_cost=shipping_cost,
+        total=money(subtotal) + tax + shipping_cost,
+    )
+    with transaction.atomic():
+        order.save()
+        for item in items:
+            item.order = order
+        OrderItem.objects.bulk_create(items)
+        rollups.add_items(order, items)
+
+    # Prime order.items.all() the way prefetch_related would.
+    prefetched = order.items.all()
+    prefetched._result_cache = items
+    prefetched._prefetch_done = True
+    order._prefetched_objects_cache = {'items': prefetched}
+    return order
@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from apps.orders.models import Order, OrderItem
+from apps.orders.views import CheckoutView
+from apps.products.models import Product
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure checkout throughput for carts of different sizes. Every order is '
+        'rolled back, so it is safe to run against a real database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, nargs='+', default=[1, 10, 50],
+                            help='Cart sizes (distinct products per order) to test (default: 1 10 50)')
+        parser.add_argument('--orders', type=int, default=100,
+                            help='Orders to place per cart size (default: 100)')
+        parser.add_argument('--legacy', action='store_true',
+                            help='Also time saving the order and then each OrderItem one by one')
+
+    def handle(self, *args, **options):
+        products = list(Product.objects.filter(is_available=True).order_by('id')[:max(options['lines'])])
+        if len(products) < max(options['lines']):
+            raise CommandError(f'Need {max(options["lines"])} available products, found {len(products)}')
+
+        view = CheckoutView.as_view()
+        factory = APIRequestFactory()
+        for lines in options['lines']:
+            cart = products[:lines]
+            payload = {
+                'items': [{'product': p.pk, 'quantity': 2, 'price': str(p.price)} for p in cart],
+                'email': 'load-test@example.com',
+                'phone_number': '555-0100',
+                'shipping_address': '1 Test Street',
+                'payment_method': 'card',
+            }
+
+            def checkout():
+                response = view(factory.post('/api/orders/checkout/', payload, format='json'))
+                if response.status_code != 201:
+                    raise CommandError(f'Checkout failed ({response.status_code}): {response.data}')
+
+            self.report(f'checkout, {lines} lines', self.run(checkout, options['orders']))
+            if options['legacy']:
+                self.report(f'per-item saves, {lines} lines', self.run(lambda: self.legacy(cart), options['orders']))
+
+    def run(self, place, count):
+        """Time ``count`` calls of ``place``, each in a transaction that is rolled back."""
+        elapsed = 0.0
+        queries = 0
+        for _ in range(count):
+            try:
+                with transaction.atomic():
+                    connection.queries_log.clear()
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        place()
+                        elapsed += time.perf_counter() - started
+                    queries += len(captured)
+                    raise Rollback
+            except Rollback:
+                pass
+        return count, elapsed, queries
+
+    def legacy(self, cart):
+        subtotal = sum(p.price * 2 for p in cart)
+        order = Order.objects.create(
+            email='load-test@example.com', phone_number='555-0100', shipping_address='1 Test Street',
+            billing_address='1 Test Street', payment_method='card', subtotal=subtotal, total=subtotal,
+        )
+        for product in cart:
+            OrderItem(order=order, product=product, product_name=product.name,
+                      product_price=product.price, quantity=2).save()
+
+    def report(self, label, result):
+        count, elapsed, queries = result
+        self.stdout.write(
+            f'{label:>26}: {count / elapsed:8.1f} orders/s  '
+            f'{elapsed * 1000 / count:7.2f} ms/order  {queries / count:6.1f} queries/order'
+        )
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.orders.models import Order
+
+EMAIL = 'order-number-test@example.com'
+
+
+class Command(BaseCommand):
+    help = (
+        'Create many orders at once from concurrent threads and check that every one '
+        'gets a unique order number on the first try. The orders are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=500, help='Orders to create (default: 500)')
+        parser.add_argument('--threads', type=int, default=50, help='Concurrent threads (default: 50)')
+        parser.add_argument('--keep', action='store_true', help='Keep the test orders')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        barrier = threading.Barrier(threads)
+
+        def worker(count):
+            numbers, errors = [], []
+            try:
+                barrier.wait()
+                for _ in range(count):
+                    try:
+                        order = Order.objects.create(
+                            email=EMAIL, phone_number='555-0100', shipping_address='1 Test Street',
+                            billing_address='1 Test Street', payment_method='card', subtotal=1, total=1,
+                        )
+                        numbers.append((order.pk, order.order_number))
+                    except Exception as exc:
+                        errors.append(repr(exc))
+            finally:
+                close_old_connections()
+            return numbers, errors
+
+        shares = [options['orders'] // threads + (i < options['orders'] % threads) for i in range(threads)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(worker, shares))
+        elapsed = time.perf_counter() - started
+
+        created = [number for numbers, _ in results for number in numbers]
+        errors = Counter(error for _, errors in results for error in errors)
+        duplicates = [n for n, seen in Counter(n for _, n in created).items() if seen > 1]
+        self.stdout.write(
+            f'{len(created)} orders from {threads} threads in {elapsed:.2f}s '
+            f'({len(created) / elapsed:.1f} orders/s)'
+        )
+        if created:
+            self.stdout.write(f'Numbers {min(created)[1]} .. {max(created)[1]}')
+        if not options['keep']:
+            Order.objects.filter(pk__in=[pk for pk, _ in created]).delete()
+
+        for error, seen in errors.most_common(5):
+            self.stderr.write(f'{seen} x {error}')
+        if errors or duplicates:
+            raise CommandError(f'{sum(errors.values())} failed orders, {len(duplicates)} duplicate numbers')
+        self.stdout.write(self.style.SUCCESS('All order numbers unique, no failed orders.'))
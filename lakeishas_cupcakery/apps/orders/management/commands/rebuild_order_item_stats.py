@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from apps.orders.models import Order
+
+
+class Command(BaseCommand):
+    help = "Recompute each order's stored item_count and items_subtotal from its line items"
+
+    def handle(self, *args, **options):
+        stale = Order.objects.with_item_stats().exclude(
+            item_count=F('items_quantity'), items_subtotal=F('items_amount')
+        )
+        fixed = stale.update(item_count=F('items_quantity'), items_subtotal=F('items_amount'))
+        self.stdout.write(self.style.SUCCESS(f'Fixed {fixed} orders'))
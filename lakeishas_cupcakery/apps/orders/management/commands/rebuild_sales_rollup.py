@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.orders.models import Order
+from apps.orders.rollups import rebuild, rollup_date
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily sales rollup for a date range (default: all orders)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat,
+                            help='First day to rebuild, YYYY-MM-DD (default: first order)')
+        parser.add_argument('--end', type=date.fromisoformat,
+                            help='Last day to rebuild, YYYY-MM-DD (default: today)')
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if start is None:
+            first = Order.objects.aggregate(first=Min('created_at'))['first']
+            if first is None:
+                self.stdout.write(self.style.WARNING('No orders to roll up.'))
+                return
+            start = rollup_date(first)
+        if end is None:
+            last = Order.objects.aggregate(last=Max('created_at'))['last']
+            end = max(timezone.localdate(), rollup_date(last) if last else start)
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        rows = rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} rollup rows for {start} to {end}'))
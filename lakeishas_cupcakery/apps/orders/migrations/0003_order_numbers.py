@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+def install_order_number_sequence(apps, schema_editor):
+    from apps.orders.numbers import install_order_number_sequence
+    install_order_number_sequence(schema_editor.connection)
+
+
+def uninstall_order_number_sequence(apps, schema_editor):
+    from apps.orders.numbers import uninstall_order_number_sequence
+    uninstall_order_number_sequence(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_dailysalesrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderNumberCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(install_order_number_sequence, uninstall_order_number_sequence),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:26
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_item_stats(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    items = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order')
+    Order.objects.update(
+        item_count=Coalesce(Subquery(items.annotate(total=Sum('quantity')).values('total')), 0),
+        items_subtotal=Coalesce(
+            Subquery(items.annotate(total=Sum('subtotal')).values('total')), 0,
+            output_field=models.DecimalField(max_digits=10, decimal_places=2)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_numbers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='items_subtotal',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_item_stats, migrations.RunPython.noop),
+    ]
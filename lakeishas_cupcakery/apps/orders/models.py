@@ -1,12 +1,43 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from apps.products.models import Product
 from apps.users.models import User
 
 
+class OrderQuerySet(models.QuerySet):
+    def add_item_stats(self, quantity, amount):
+        """Add deltas to the stored ``item_count`` and ``items_subtotal``."""
+        return self.update(
+            item_count=F('item_count') + quantity,
+            items_subtotal=F('items_subtotal') + amount,
+            updated_at=timezone.now(),
+        )
+
+    def with_item_stats(self):
+        """
+        Annotate ``items_quantity`` and ``items_amount`` computed from the
+        line items in the same query (one subquery each, no per-order
+        queries). Lists normally read the stored ``item_count`` and
+        ``items_subtotal`` instead; this is the source of truth they are
+        checked and repaired against.
+        """
+        items = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order')
+        return self.annotate(
+            items_quantity=Coalesce(
+                Subquery(items.annotate(total=Sum('quantity')).values('total')), 0
+            ),
+            items_amount=Coalesce(
+                Subquery(items.annotate(total=Sum('subtotal')).values('total')), 0,
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+        )
+
+
 class Order(models.Model):
     """
     Model representing a customer's order.
@@ -51,33 +82,42 @@ class Order(models.Model):
     payment_method = models.CharField(max_length=50)
     payment_status = models.CharField(max_length=50, default='pending')
     payment_id = models.CharField(max_length=100, blank=True, null=True)
+    # Units and line-item subtotal across the order's items, kept current by
+    # the item signals (see signals.py) so lists need no per-order queries.
+    item_count = models.PositiveIntegerField(default=0)
+    items_subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrderQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
+        indexes = [
+            # A customer's order history, in keyset order.
+            models.Index(fields=['user', '-created_at', 'id'], name='order_user_created_id_idx'),
+        ]
     
     def __str__(self):
         return f"Order {self.order_number}"
     
     def save(self, *args, **kwargs):
-        if not self.order_number:
-            # Generate order number if not provided
-            self.order_number = self._generate_order_number()
-        super().save(*args, **kwargs)
+        # Atomic so the sales rollup (updated from post_save) and, on databases
+        # without sequences, the order number counter commit with it.
+        with transaction.atomic():
+            if not self.order_number:
+                # Generate order number if not provided
+                self.order_number = self._generate_order_number()
+            super().save(*args, **kwargs)
     
     def _generate_order_number(self):
         """Generate a unique order number."""
-        timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
-        return f"ORD-{timestamp}"
-    
-    @property
-    def item_count(self):
-        """Return the total number of items in the order."""
-        return sum(item.quantity for item in self.items.all())
+        from .numbers import next_order_number
 
+        return next_order_number()
+    
 
 class OrderItem(models.Model):
     """
@@ -112,7 +152,59 @@ class OrderItem(models.Model):
     def save(self, *args, **kwargs):
         # Calculate subtotal before saving
         self.subtotal = self.product_price * self.quantity
-        super().save(*args, **kwargs)
-        # Update order totals
-        self.order.save()
+        # The order's item_count and items_subtotal follow in post_save.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+
+class OrderNumberCounter(models.Model):
+    """Last order number handed out, on databases without sequences (see ``numbers.py``)."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
 
+class DailySalesRollup(models.Model):
+    """
+    Pre-aggregated sales per day, product and order status.
+
+    Rows with a product hold that product's line items; the row with
+    ``product=None`` holds order-level totals (order count and ``Order.total``,
+    which includes tax and shipping). Kept current by ``signals.py`` inside
+    the same transaction as the order change; ``rebuild_sales_rollup``
+    recomputes any date range from scratch.
+    """
+    date = models.DateField()
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    product_name = models.CharField(max_length=255, blank=True)
+    order_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'product', 'status'],
+                name='daily_sales_rollup_product_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['date', 'status'],
+                condition=models.Q(product__isnull=True),
+                name='daily_sales_rollup_order_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.product_name or 'all orders'} ({self.status})"
@@ -0,0 +1,10 @@
+from apps.products.pagination import ProductKeysetPagination
+
+
+class OrderHistoryPagination(ProductKeysetPagination):
+    """
+    Keyset pages of a customer's orders, newest first, with the catalog's
+    ``(-created_at, id)`` cursors: no COUNT(*) and no OFFSET, so a customer
+    with years of orders costs the same per page as a new one.
+    """
+    max_page_size = 50
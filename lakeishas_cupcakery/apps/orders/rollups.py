@@ -0,0 +1,202 @@
+"""
+Maintenance of :class:`~.models.DailySalesRollup`.
+
+Every change is applied as a delta: an order or line item's old contribution
+is subtracted from its (date, product, status) row and its new one added, so
+the table never needs a full recompute. :func:`rebuild` does one anyway for
+a date range, for backfills and repairs.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Max, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailySalesRollup, Order, OrderItem
+from .timeseries import invalidate_closed_buckets
+
+# Statuses that count as sales in analytics (cancelled/refunded do not).
+REVENUE_STATUSES = (Order.PENDING, Order.PROCESSING, Order.SHIPPED, Order.DELIVERED)
+
+
+def rollup_date(created_at):
+    return timezone.localdate(created_at) if timezone.is_aware(created_at) else created_at.date()
+
+
+def apply_delta(date, product_id, status, product_name='', order_count=0, quantity=0, revenue=0):
+    """Add the deltas to one rollup row, creating it if needed."""
+    if not (order_count or quantity or revenue):
+        return
+    if date < timezone.localdate():
+        # A past day changed, so memoized chart buckets are out of date.
+        transaction.on_commit(invalidate_closed_buckets)
+    rows = DailySalesRollup.objects.filter(date=date, product_id=product_id, status=status)
+    changes = {
+        'order_count': F('order_count') + order_count,
+        'quantity': F('quantity') + quantity,
+        'revenue': F('revenue') + revenue,
+    }
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DailySalesRollup.objects.create(
+                date=date, product_id=product_id, status=status, product_name=product_name,
+                order_count=order_count, quantity=quantity, revenue=revenue,
+            )
+    except IntegrityError:
+        # Another transaction created the row first.
+        rows.update(**changes)
+
+
+def move_order(order_id, old, new):
+    """
+    Move an order's contribution from ``old`` to ``new`` (each a dict of
+    ``date``, ``status`` and ``total``, or ``None`` when absent).
+    """
+    if old == new:
+        return
+    if old is not None:
+        apply_delta(old['date'], None, old['status'], order_count=-1, revenue=-old['total'])
+    if new is not None:
+        apply_delta(new['date'], None, new['status'], order_count=1, revenue=new['total'])
+
+    # Line items follow the order when its day or status changes.
+    if old is None or new is None or (old['date'], old['status']) == (new['date'], new['status']):
+        return
+    lines = (
+        OrderItem.objects.filter(order_id=order_id, product__isnull=False)
+        .values('product_id')
+        .annotate(lines=Count('id'), units=Sum('quantity'), amount=Sum('subtotal'))
+        .order_by()
+    )
+    for line in lines:
+        apply_delta(old['date'], line['product_id'], old['status'],
+                    order_count=-line['lines'], quantity=-line['units'], revenue=-line['amount'])
+        apply_delta(new['date'], line['product_id'], new['status'],
+                    order_count=line['lines'], quantity=line['units'], revenue=line['amount'])
+
+
+def move_item(old, new):
+    """Same as :func:`move_order` for one line item (``product_id``, ``product_name``, ``quantity``, ``subtotal``, ``date``, ``status``)."""
+    if old == new:
+        return
+    if old is not None and old['product_id'] is not None:
+        apply_delta(old['date'], old['product_id'], old['status'],
+                    order_count=-1, quantity=-old['quantity'], revenue=-old['subtotal'])
+    if new is not None and new['product_id'] is not None:
+        apply_delta(new['date'], new['product_id'], new['status'], product_name=new['product_name'],
+                    order_count=1, quantity=new['quantity'], revenue=new['subtotal'])
+
+
+def add_items(order, items):
+    """
+    Add a new order's line items in a constant number of queries: one
+    ``UPDATE`` (a ``CASE`` per product) for the rows that exist and one
+    ``bulk_create`` for the rest, where :func:`move_item` per item would
+    cost a query or more each.
+    """
+    lines = {}
+    for item in items:
+        if item.product_id is None:
+            continue
+        count, quantity, revenue, name = lines.get(item.product_id, (0, 0, 0, item.product_name))
+        lines[item.product_id] = (count + 1, quantity + item.quantity, revenue + item.subtotal, name)
+    if not lines:
+        return
+    date = rollup_date(order.created_at)
+    if date < timezone.localdate():
+        transaction.on_commit(invalidate_closed_buckets)
+
+    rows = DailySalesRollup.objects.filter(date=date, status=order.status, product_id__in=list(lines))
+    existing = set(rows.values_list('product_id', flat=True))
+    if existing:
+        def delta(field, index, output_field):
+            whens = [When(product_id=pk, then=Value(lines[pk][index])) for pk in existing]
+            return F(field) + Case(*whens, default=Value(0), output_field=output_field)
+
+        rows.filter(product_id__in=existing).update(
+            order_count=delta('order_count', 0, IntegerField()),
+            quantity=delta('quantity', 1, IntegerField()),
+            revenue=delta('revenue', 2, DecimalField(max_digits=14, decimal_places=2)),
+        )
+    missing = [pk for pk in lines if pk not in existing]
+    if not missing:
+        return
+    try:
+        with transaction.atomic():
+            DailySalesRollup.objects.bulk_create([
+                DailySalesRollup(date=date, product_id=pk, status=order.status, product_name=lines[pk][3],
+                                 order_count=lines[pk][0], quantity=lines[pk][1], revenue=lines[pk][2])
+                for pk in missing
+            ])
+    except IntegrityError:
+        # Another transaction created some of the rows first.
+        for pk in missing:
+            count, quantity, revenue, name = lines[pk]
+            apply_delta(date, pk, order.status, product_name=name,
+                        order_count=count, quantity=quantity, revenue=revenue)
+
+
+def order_state(order):
+    return {'date': rollup_date(order.created_at), 'status': order.status, 'total': order.total}
+
+
+def item_state(item, order):
+    return {
+        'order_id': item.order_id,
+        'product_id': item.product_id,
+        'product_name': item.product_name,
+        'quantity': item.quantity,
+        'subtotal': item.subtotal,
+        'date': rollup_date(order.created_at),
+        'status': order.status,
+    }
+
+
+def day_bounds(start, end):
+    """Aware datetimes covering the whole days ``start``..``end`` inclusive."""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+@transaction.atomic
+def rebuild(start, end):
+    """Recompute the rollup rows for ``start``..``end`` (dates, inclusive)."""
+    since, until = day_bounds(start, end)
+    DailySalesRollup.objects.filter(date__range=(start, end)).delete()
+
+    rows = [
+        DailySalesRollup(date=row['day'], product=None, status=row['status'],
+                         order_count=row['orders'], revenue=row['amount'] or 0)
+        for row in Order.objects.filter(created_at__gte=since, created_at__lt=until)
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'status')
+        .annotate(orders=Count('id'), amount=Sum('total'))
+        .order_by()
+    ]
+    items = (
+        OrderItem.objects.filter(
+            order__created_at__gte=since, order__created_at__lt=until, product__isnull=False
+        )
+        .annotate(day=TruncDate('order__created_at'), status=F('order__status'))
+        .values('day', 'status', 'product_id')
+        .annotate(
+            lines=Count('id'), units=Sum('quantity'), amount=Sum('subtotal'),
+            name=Max('product_name'),
+        )
+        .order_by()
+    )
+    rows.extend(
+        DailySalesRollup(date=row['day'], product_id=row['product_id'], status=row['status'],
+                         product_name=row['name'] or '', order_count=row['lines'],
+                         quantity=row['units'] or 0, revenue=row['amount'] or 0)
+        for row in items
+    )
+    DailySalesRollup.objects.bulk_create(rows, batch_size=1000)
+    transaction.on_commit(invalidate_closed_buckets)
+    return len(rows)
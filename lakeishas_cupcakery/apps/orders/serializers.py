@@ -0,0 +1,65 @@
+from rest_framework import serializers
+
+from .models import Order, OrderItem
+
+MAX_CHECKOUT_LINES = 100
+MAX_LINE_QUANTITY = 1000
+
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderItem
+        fields = ['id', 'product', 'product_name', 'product_price', 'quantity', 'subtotal']
+        read_only_fields = fields
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    items = OrderItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            'id', 'order_number', 'status', 'email', 'phone_number', 'shipping_address',
+            'billing_address', 'notes', 'item_count', 'subtotal', 'tax', 'shipping_cost', 'total',
+            'payment_method', 'payment_status', 'created_at', 'items'
+        ]
+        read_only_fields = fields
+
+
+class OrderHistorySerializer(OrderSerializer):
+    """The columns the order history shows; the view fetches only these."""
+    class Meta(OrderSerializer.Meta):
+        fields = [
+            'id', 'order_number', 'status', 'item_count', 'subtotal', 'tax', 'shipping_cost', 'total',
+            'payment_status', 'created_at', 'items'
+        ]
+        read_only_fields = fields
+
+
+class OrderSummarySerializer(serializers.Serializer):
+    order_count = serializers.IntegerField()
+    total_spent = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class CheckoutItemSerializer(serializers.Serializer):
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, max_value=MAX_LINE_QUANTITY)
+    # The unit price the customer saw; the checkout fails if it has changed.
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+
+
+class CheckoutSerializer(serializers.Serializer):
+    """A whole cart, validated for shape only; ``checkout.place_order`` checks products and prices."""
+    items = CheckoutItemSerializer(many=True, allow_empty=False, max_length=MAX_CHECKOUT_LINES)
+    email = serializers.EmailField(required=False)
+    phone_number = serializers.CharField(max_length=20)
+    shipping_address = serializers.CharField()
+    billing_address = serializers.CharField(required=False, allow_blank=True)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    payment_method = serializers.CharField(max_length=50)
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        if not attrs.get('email') and not user.is_authenticated:
+            raise serializers.ValidationError({'email': 'An email address is required for guest checkout.'})
+        return attrs
@@ -0,0 +1,91 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import rollups, summary
+from .models import Order, OrderItem
+
+
+@receiver(pre_save, sender=Order)
+def remember_order_state(sender, instance, **kwargs):
+    """Keep the pre-save values so post_save can apply a rollup delta."""
+    instance._rollup_previous = None
+    instance._previous_user_id = None
+    if instance.pk:
+        previous = Order.objects.filter(pk=instance.pk).values('user_id', 'created_at', 'status', 'total').first()
+        if previous:
+            instance._previous_user_id = previous['user_id']
+            instance._rollup_previous = {
+                'date': rollups.rollup_date(previous['created_at']),
+                'status': previous['status'],
+                'total': previous['total'],
+            }
+
+
+@receiver(post_save, sender=Order)
+def update_order_rollup(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    rollups.move_order(instance.pk, previous, rollups.order_state(instance))
+    summary.move_order(getattr(instance, '_previous_user_id', None), previous,
+                       instance.user_id, rollups.order_state(instance))
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_rollup(sender, instance, **kwargs):
+    rollups.move_order(instance.pk, rollups.order_state(instance), None)
+    summary.move_order(instance.user_id, rollups.order_state(instance), None, None)
+
+
+@receiver(pre_save, sender=OrderItem)
+def remember_item_state(sender, instance, **kwargs):
+    instance._rollup_previous = None
+    if instance.pk:
+        previous = (
+            OrderItem.objects.filter(pk=instance.pk)
+            .select_related('order')
+            .only('order', 'product', 'product_name', 'quantity', 'subtotal', 'order__created_at', 'order__status')
+            .first()
+        )
+        if previous:
+            instance._rollup_previous = rollups.item_state(previous, previous.order)
+
+
+@receiver(post_save, sender=OrderItem)
+def update_item_rollup(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    rollups.move_item(getattr(instance, '_rollup_previous', None), rollups.item_state(instance, instance.order))
+
+
+@receiver(post_save, sender=OrderItem)
+def update_order_item_stats(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is not None and previous['order_id'] == instance.order_id:
+        quantity = instance.quantity - previous['quantity']
+        amount = instance.subtotal - previous['subtotal']
+        if quantity or amount:
+            Order.objects.filter(pk=instance.order_id).add_item_stats(quantity, amount)
+        return
+    if previous is not None:
+        Order.objects.filter(pk=previous['order_id']).add_item_stats(-previous['quantity'], -previous['subtotal'])
+    Order.objects.filter(pk=instance.order_id).add_item_stats(instance.quantity, instance.subtotal)
+
+
+@receiver(post_delete, sender=OrderItem)
+def remove_order_item_stats(sender, instance, **kwargs):
+    # Counts that already drifted (items bulk-created elsewhere) are left for
+    # rebuild_order_item_stats instead of failing the delete.
+    Order.objects.filter(pk=instance.order_id, item_count__gte=instance.quantity).add_item_stats(
+        -instance.quantity, -instance.subtotal
+    )
+
+
+@receiver(post_delete, sender=OrderItem)
+def remove_item_rollup(sender, instance, **kwargs):
+    # During an order's cascade delete the order row is still present here.
+    order = Order.objects.filter(pk=instance.order_id).only('created_at', 'status').first()
+    if order is not None:
+        rollups.move_item(rollups.item_state(instance, order), None)
@@ -0,0 +1,94 @@
+"""
+Per-customer lifetime order summary (order count, total spent).
+
+The summary is computed with one aggregate on a cache miss and cached under
+the customer's current *generation*, a random token in its own cache key.
+After an order change commits, the order signals replace the token instead
+of adjusting the cached numbers, which retires the summary. A read takes the
+token before it runs the aggregate, so a result computed while an order was
+committing lands under the retired token and is never served. With the
+default per-process cache other workers only see another worker's changes
+after ``ORDER_SUMMARY_TIMEOUT`` (seconds, default 600); a shared cache
+(Redis, memcached) makes them immediate.
+"""
+import uuid
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from .models import Order
+from .rollups import REVENUE_STATUSES
+
+DEFAULT_TIMEOUT = 600
+CENT = Decimal('0.01')
+
+
+def generation_key(user_id):
+    return f'orders:summary:{user_id}:generation'
+
+
+def generation(user_id):
+    """The customer's current generation token, starting a new one if there is none."""
+    key = generation_key(user_id)
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        token = cache.get(key)
+    return token
+
+
+def cents(amount):
+    return int((amount or 0) * 100)
+
+
+def spent(state):
+    """What an order state (``status``/``total`` dict or ``None``) adds to total spent."""
+    if state is None or state['status'] not in REVENUE_STATUSES:
+        return 0
+    return cents(state['total'])
+
+
+def customer_summary(user_id):
+    """``{'order_count': n, 'total_spent': Decimal}`` for every order the customer placed."""
+    key = f'orders:summary:{user_id}:{generation(user_id)}'
+    cached = cache.get(key)
+    if cached is not None:
+        count, total = cached
+    else:
+        totals = Order.objects.filter(user_id=user_id).order_by().aggregate(
+            count=Count('id'), spent=Sum('total', filter=Q(status__in=REVENUE_STATUSES)),
+        )
+        count, total = totals['count'], cents(totals['spent'])
+        cache.set(key, (count, total), getattr(settings, 'ORDER_SUMMARY_TIMEOUT', DEFAULT_TIMEOUT))
+    return {'order_count': count, 'total_spent': (Decimal(total) / 100).quantize(CENT)}
+
+
+def invalidate_summary(user_id):
+    if user_id is not None:
+        cache.set(generation_key(user_id), uuid.uuid4().hex, None)
+
+
+def move_order(old_user_id, old, new_user_id, new):
+    """
+    Retire the cached summaries an order change affects once the transaction
+    commits (``old``/``new`` as in :func:`.rollups.move_order`).
+    """
+    if old_user_id == new_user_id:
+        changed = (new is None) != (old is None) or spent(new) != spent(old)
+        users = [new_user_id] if changed else []
+    else:
+        users = [old_user_id] if old is not None else []
+        if new is not None:
+            users.append(new_user_id)
+    users = [user_id for user_id in users if user_id is not None]
+    if not users:
+        return
+
+    def apply():
+        for user_id in users:
+            invalidate_summary(user_id)
+
+    transaction.on_commit(apply)
@@ -0,0 +1,139 @@
+"""
+Dense order-count and revenue series over :class:`~.models.DailySalesRollup`.
+
+:func:`order_series` splits ``start``..``end`` into day, week (ISO, Monday
+first) or month buckets, clipped to the range, and returns one value per
+bucket with empty buckets filled with zero.
+
+Buckets that ended before today cannot change except through a correction
+to an old order (or a rollup rebuild), so their values are memoized in the
+cache; such corrections bump a version key that retires every memoized
+bucket. A chart reload therefore only sums the rollup rows of the still-open
+bucket(s).
+
+The version key only retires memos for processes that share the cache. With
+the default per-process cache a correction made by another worker (or by
+``rebuild_sales_rollup``) is invisible here, so memos then live for
+``LOCAL_MEMO_TIMEOUT`` seconds instead of 30 days. ``ORDER_SERIES_MEMO_TIMEOUT``
+overrides either.
+"""
+import hashlib
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import DailySalesRollup
+
+GRANULARITIES = ('day', 'week', 'month')
+CACHE_PREFIX = 'order-series:'
+VERSION_KEY = CACHE_PREFIX + 'version'
+MEMO_TIMEOUT = 60 * 60 * 24 * 30
+LOCAL_MEMO_TIMEOUT = 60
+LABEL_FORMATS = {'day': '%Y-%m-%d', 'week': '%Y-%m-%d', 'month': '%b %Y'}
+TRUNCATE = {'week': TruncWeek, 'month': TruncMonth}
+
+
+def bucket_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, granularity):
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    if granularity == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def buckets(start, end, granularity):
+    """``[(bucket start, first day, last day), ...]`` with days clipped to the range."""
+    result = []
+    current = bucket_start(start, granularity)
+    while current <= end:
+        following = next_bucket(current, granularity)
+        result.append((current, max(current, start), min(following - timedelta(days=1), end)))
+        current = following
+    return result
+
+
+def memo_timeout():
+    default = LOCAL_MEMO_TIMEOUT if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache) else MEMO_TIMEOUT
+    return getattr(settings, 'ORDER_SERIES_MEMO_TIMEOUT', default)
+
+
+def invalidate_closed_buckets():
+    """Retire every memoized bucket (a past day's figures changed)."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 1, None)
+
+
+def _memo_keys(bucket_list, granularity, statuses):
+    version = cache.get(VERSION_KEY, 0)
+    scope = hashlib.md5(','.join(sorted(statuses)).encode('utf-8')).hexdigest()[:8]
+    return [
+        f'{CACHE_PREFIX}{version}:{scope}:{granularity}:{first.isoformat()}:{last.isoformat()}'
+        for _, first, last in bucket_list
+    ]
+
+
+def _query(first, last, granularity, statuses):
+    """``{bucket start: (orders, revenue)}`` for the days ``first``..``last``, grouped in SQL."""
+    rows = DailySalesRollup.objects.filter(
+        product__isnull=True, status__in=statuses, date__range=(first, last)
+    )
+    bucket = F('date') if granularity == 'day' else TRUNCATE[granularity]('date')
+    rows = (
+        rows.annotate(bucket=bucket)
+        .values('bucket')
+        .annotate(orders=Sum('order_count'), revenue=Sum('revenue'))
+        .order_by()
+    )
+    return {row['bucket']: (row['orders'] or 0, row['revenue'] or Decimal('0')) for row in rows}
+
+
+def order_series(start, end, granularity='day', statuses=None):
+    """
+    Return ``{'labels', 'buckets', 'orders', 'revenue'}`` for ``start``..``end``
+    (dates, inclusive); each list has one entry per bucket.
+    """
+    from .rollups import REVENUE_STATUSES
+
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'granularity must be one of {", ".join(GRANULARITIES)}')
+    statuses = tuple(statuses or REVENUE_STATUSES)
+    today = timezone.localdate()
+    bucket_list = buckets(start, end, granularity)
+    keys = _memo_keys(bucket_list, granularity, statuses)
+
+    closed = {key for key, (_, _, last) in zip(keys, bucket_list) if last < today}
+    values = cache.get_many(list(closed))
+    missing = [bucket for key, bucket in zip(keys, bucket_list) if key not in values]
+    if missing:
+        fresh = _query(missing[0][1], missing[-1][2], granularity, statuses)
+        computed = {}
+        for key, (bucket, _, _) in zip(keys, bucket_list):
+            if key not in values:
+                computed[key] = fresh.get(bucket, (0, Decimal('0')))
+        cache.set_many({key: value for key, value in computed.items() if key in closed}, memo_timeout())
+        values.update(computed)
+
+    # One pass over the buckets fills the dense arrays.
+    series = [values[key] for key in keys]
+    return {
+        'labels': [bucket.strftime(LABEL_FORMATS[granularity]) for bucket, _, _ in bucket_list],
+        'buckets': [bucket for bucket, _, _ in bucket_list],
+        'orders': [orders for orders, _ in series],
+        'revenue': [revenue for _, revenue in series],
+    }
@@ -9,5 +9,6 @@ router = DefaultRouter()
 # router.register(r'orders', views.OrderViewSet)
 
 urlpatterns = [
-    # Add your URL patterns here
+    path('checkout/', views.CheckoutView.as_view(), name='checkout'),
+    path('mine/', views.MyOrdersView.as_view(), name='my-orders'),
 ] + router.urls
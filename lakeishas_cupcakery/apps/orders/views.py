@@ -1,3 +1,62 @@
-from django.shortcuts import render
+from django.db.models import Prefetch
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
-# Create your views here.
+from core.decorators import idempotent
+
+from .checkout import CheckoutError, place_order
+from .models import OrderItem
+from .pagination import OrderHistoryPagination
+from .serializers import CheckoutSerializer, OrderHistorySerializer, OrderSerializer, OrderSummarySerializer
+from .summary import customer_summary
+
+
+class CheckoutView(generics.GenericAPIView):
+    """
+    Place an order for a whole cart in one request (guests included):
+    ``{"items": [{"product": 1, "quantity": 2, "price": "3.50"}, ...], ...}``.
+    Clients should send an ``Idempotency-Key`` so a retried checkout
+    returns the first order instead of placing another.
+    """
+    serializer_class = CheckoutSerializer
+    permission_classes = [permissions.AllowAny]
+
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            order = place_order(request.user, serializer.validated_data)
+        except CheckoutError as exc:
+            raise ValidationError(exc.errors)
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+
+class MyOrdersView(generics.ListAPIView):
+    """
+    The signed-in customer's orders with their items, newest first, in
+    keyset pages (``?cursor=``). ``?summary=1`` adds the lifetime order count
+    and total spent. One query for the page and one for its items, however
+    many orders the customer has; the summary comes from the cache.
+    """
+    serializer_class = OrderHistorySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderHistoryPagination
+    filter_backends = []
+
+    def get_queryset(self):
+        items = OrderItem.objects.only(
+            'order', 'product', 'product_name', 'product_price', 'quantity', 'subtotal'
+        ).order_by('id')
+        # user is listed because the related manager sets it on every row.
+        return self.request.user.orders.only(
+            'user', 'order_number', 'status', 'item_count', 'subtotal', 'tax', 'shipping_cost', 'total',
+            'payment_status', 'created_at'
+        ).prefetch_related(Prefetch('items', queryset=items))
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get('summary') in ('1', 'true'):
+            response.data['summary'] = OrderSummarySerializer(customer_summary(request.user.pk)).data
+        return response
@@ -1,5 +1,32 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate, pre_migrate
+
+
+def detach_search_triggers(sender, using, **kwargs):
+    from .search import detach_sqlite_triggers, sqlite_search_index_exists
+
+    connection = connections[using]
+    if sqlite_search_index_exists(connection):
+        detach_sqlite_triggers(connection)
+
+
+def attach_search_triggers(sender, using, **kwargs):
+    from .search import attach_sqlite_triggers, sqlite_search_index_exists
+
+    connection = connections[using]
+    if sqlite_search_index_exists(connection):
+        attach_sqlite_triggers(connection)
+
 
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.products'
\ No newline at end of file
+    name = 'apps.products'
+
+    def ready(self):
+        import apps.products.signals
+
+        # The SQLite search triggers reference other tables, which breaks the
+        # table rebuilds Django performs during migrations.
+        pre_migrate.connect(detach_search_triggers, sender=self)
+        post_migrate.connect(attach_search_triggers, sender=self)
@@ -0,0 +1,106 @@
+# lakeishas_cupcakery/apps/products/changes.py
+"""
+Delta sync for the catalog.
+
+``signals.py`` appends a :class:`~.models.CatalogChange` row for every
+product/category save and delete (including the category soft delete, which
+is a save with ``is_active=False``). ``/api/products/changes/?since=<cursor>``
+then answers with the current state of just the rows touched after the
+cursor, so a client that already holds the catalog pays O(changes) instead of
+O(catalog).
+
+The cursor is the id of the last change the client has applied. Ids are
+handed out when a change is written but only become visible when its
+transaction commits, so a transaction that commits late can land an id below
+one a client has already seen, and that client would never read it. To keep
+that window small, a change is written only after the catalog write commits,
+in its own single-INSERT transaction, and changes younger than
+``CATALOG_CHANGES_SETTLE_SECONDS`` (default 2) are held back until later ids
+can no longer appear behind them.
+
+Delivery is still best effort, not guaranteed: a change is missed if its
+INSERT stays uncommitted for longer than the settle window (a stalled
+database), and lost if the process dies between the catalog commit and the
+INSERT. Clients should do a full resync now and then (e.g. daily or on app
+start) rather than rely on deltas forever; raise the setting if the database
+commits slowly.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import CatalogChange, Category
+
+DEFAULT_SETTLE_SECONDS = 2
+DEFAULT_RETENTION_DAYS = 30
+
+
+class CursorExpired(Exception):
+    """The cursor predates the retained log; the client must resync fully."""
+
+
+def record_change(instance, action):
+    """Log ``action`` on ``instance`` once the surrounding transaction commits."""
+    kind = CatalogChange.KIND_CATEGORY if isinstance(instance, Category) else CatalogChange.KIND_PRODUCT
+    pk = instance.pk
+    transaction.on_commit(lambda: CatalogChange.objects.create(kind=kind, object_id=pk, action=action))
+
+
+def latest_cursor():
+    latest = settled_changes().order_by('-id').values_list('id', flat=True).first()
+    return latest or 0
+
+
+def settled_changes():
+    settle = getattr(settings, 'CATALOG_CHANGES_SETTLE_SECONDS', DEFAULT_SETTLE_SECONDS)
+    return CatalogChange.objects.filter(created_at__lte=timezone.now() - timedelta(seconds=settle))
+
+
+def prune_changes(days=None):
+    """Delete log rows older than ``days`` (``CATALOG_CHANGES_RETENTION_DAYS``)."""
+    if days is None:
+        days = getattr(settings, 'CATALOG_CHANGES_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = timezone.now() - timedelta(days=days)
+    # Always keep the newest row so the log floor stays known.
+    newest = CatalogChange.objects.order_by('-id').values_list('id', flat=True).first()
+    deleted, _ = CatalogChange.objects.filter(created_at__lt=cutoff).exclude(id=newest).delete()
+    return deleted
+
+
+def collect_changes(since, limit):
+    """
+    Return ``(cursor, has_more, {kind: {object_id: action}})`` for up to
+    ``limit`` log rows after ``since``; the last action per object wins.
+    Raises :class:`CursorExpired` if rows after ``since`` were pruned, or if
+    ``since`` is ahead of the log (e.g. it came from another database).
+    """
+    bounds = CatalogChange.objects.aggregate(oldest=Min('id'), newest=Max('id'))
+    if since < 0 or since > (bounds['newest'] or 0):
+        raise CursorExpired
+    if bounds['oldest'] is not None and since < bounds['oldest'] - 1:
+        raise CursorExpired
+
+    rows = list(
+        settled_changes()
+        .filter(id__gt=since)
+        .order_by('id')
+        .values_list('id', 'kind', 'object_id', 'action')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed = {CatalogChange.KIND_PRODUCT: {}, CatalogChange.KIND_CATEGORY: {}}
+    for _, kind, object_id, action in rows:
+        changed[kind][object_id] = action
+    cursor = rows[-1][0] if rows else since
+    return cursor, has_more, changed
+
+
+def split_changes(changed):
+    """Split ``{object_id: action}`` into sorted ``(upserted ids, deleted ids)``."""
+    upserted = sorted(pk for pk, action in changed.items() if action == CatalogChange.ACTION_UPSERT)
+    deleted = sorted(pk for pk, action in changed.items() if action == CatalogChange.ACTION_DELETE)
+    return upserted, deleted
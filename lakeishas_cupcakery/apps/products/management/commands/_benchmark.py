@@ -0,0 +1,70 @@
+"""
+Shared helpers for the catalog benchmark commands.
+
+Benchmarks seed synthetic rows inside a transaction that is always rolled
+back, so they can be pointed at a development database without leaving
+anything behind.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.products.models import Category, Product
+
+
+class Rollback(Exception):
+    """Raised at the end of a benchmark to discard the seeded rows."""
+
+
+@contextmanager
+def auto_now_add_disabled(model, field_name='created_at'):
+    """Let bulk_create keep explicit timestamps on an ``auto_now_add`` field."""
+    field = model._meta.get_field(field_name)
+    previous = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = previous
+
+
+def seed_products(rows, batch_size=5000, stdout=None):
+    """Bulk-insert ``rows`` synthetic products with distinct ``created_at`` values."""
+    category = Category.objects.create(name='Benchmark', slug=f'benchmark-{time.time_ns()}')
+    start = timezone.now() - timedelta(seconds=rows)
+    with auto_now_add_disabled(Product):
+        for offset in range(0, rows, batch_size):
+            batch = [
+                Product(
+                    name=f'Benchmark cupcake {n}',
+                    slug=f'{category.slug}-{n}',
+                    description=f'Synthetic product {n} for benchmarking.',
+                    price=Decimal('3.50'),
+                    category=category,
+                    image='products/benchmark.jpg',
+                    is_featured=(n % 50 == 0),
+                    created_at=start + timedelta(seconds=n),
+                    updated_at=start + timedelta(seconds=n),
+                )
+                for n in range(offset, min(offset + batch_size, rows))
+            ]
+            Product.objects.bulk_create(batch)
+            if stdout is not None:
+                stdout.write(f'  seeded {offset + len(batch)}/{rows}\r', ending='')
+    if stdout is not None:
+        stdout.write('')
+    return category
+
+
+def time_call(func, repeat=5):
+    """Return the median wall time of ``func()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.products.models import Product
+from apps.products.pagination import ProductKeysetPagination
+
+from ._benchmark import Rollback, seed_products, time_call
+
+
+class Command(BaseCommand):
+    help = 'Compare page-number and keyset pagination latency at increasing page depths'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500000,
+                            help='Number of synthetic products to seed (default: 500000)')
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per measurement; the median is reported')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        page_size = options['page_size']
+        repeat = options['repeat']
+        last_page = max(rows // page_size, 1)
+        depths = sorted({1, 10, 100, 1000, 10000, last_page // 2, last_page} & set(range(1, last_page + 1)))
+
+        factory = APIRequestFactory()
+
+        def request_for(**params):
+            return Request(factory.get('/api/products/', {'page_size': page_size, **params}))
+
+        try:
+            with transaction.atomic():
+                self.stdout.write(f'Seeding {rows} products...')
+                seed_products(rows, stdout=self.stdout)
+                queryset = Product.objects.filter(is_available=True).select_related('category')
+
+                keyset = ProductKeysetPagination()
+                self.stdout.write(f"{'page':>8} {'page-number ms':>16} {'keyset ms':>12}")
+                for page in depths:
+                    page_number = PageNumberPagination()
+                    page_number.page_size = page_size
+                    offset_ms = time_call(
+                        lambda: page_number.paginate_queryset(queryset, request_for(page=page)),
+                        repeat=repeat,
+                    )
+
+                    # Position the cursor on the last row of the previous page (untimed).
+                    params = {}
+                    if page > 1:
+                        anchor = queryset.order_by(*keyset.ordering)[(page - 1) * page_size - 1]
+                        params['cursor'] = keyset.encode_cursor(anchor)
+                    keyset_ms = time_call(
+                        lambda: keyset.paginate_queryset(queryset, request_for(**params)),
+                        repeat=repeat,
+                    )
+                    self.stdout.write(f'{page:>8} {offset_ms:>16.2f} {keyset_ms:>12.2f}')
+                raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.SUCCESS('Done; seeded rows rolled back.'))
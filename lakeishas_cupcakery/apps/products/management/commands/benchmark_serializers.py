@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.products.models import Product
+from apps.products.serializers import ProductSerializer, ProductValuesSerializer
+
+from ._benchmark import Rollback, seed_products, time_call
+
+
+class Command(BaseCommand):
+    help = 'Compare ProductSerializer and the values() fast path in rows/sec'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                            help='Result sizes to serialize (default: 100 1000 10000)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per measurement; the median is reported')
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['sizes'])
+        repeat = options['repeat']
+        request = Request(APIRequestFactory().get('/api/products/', HTTP_HOST=settings.ALLOWED_HOSTS[0]))
+
+        try:
+            with transaction.atomic():
+                category = seed_products(sizes[-1])
+                base = Product.objects.filter(category=category).order_by('-created_at', 'id')
+
+                self.stdout.write(f"{'rows':>8} {'model rows/s':>14} {'values rows/s':>15} {'speedup':>9}")
+                for size in sizes:
+                    def model_path():
+                        queryset = base.select_related('category')[:size]
+                        return ProductSerializer(queryset, many=True, context={'request': request}).data
+
+                    def values_path():
+                        rows = ProductValuesSerializer.values(base)[:size]
+                        return ProductValuesSerializer(rows, request).data
+
+                    if [dict(row) for row in model_path()] != values_path():
+                        raise CommandError(f'Fast path output differs from ProductSerializer at {size} rows')
+
+                    model_ms = time_call(model_path, repeat=repeat)
+                    values_ms = time_call(values_path, repeat=repeat)
+                    self.stdout.write(
+                        f'{size:>8} {size / model_ms * 1000:>14.0f} '
+                        f'{size / values_ms * 1000:>15.0f} {model_ms / values_ms:>8.1f}x'
+                    )
+                raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.SUCCESS('Done; seeded rows rolled back.'))
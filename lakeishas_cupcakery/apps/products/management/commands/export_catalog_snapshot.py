@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import tempfile
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory
+from django.utils import timezone
+
+from apps.products.models import Category, Product
+from apps.products.serializers import CategorySerializer, ProductValuesSerializer
+
+SHARD_DIR = 'shards'
+HASH_LENGTH = 16
+
+
+class ShardWriter:
+    """
+    Stream one JSON document to a temp file while hashing it, then move it
+    to ``<stem>.<hash>.json``. If that file already exists the content is
+    unchanged and the temp file is discarded, so unchanged shards are never
+    rewritten (and keep their CDN cache entries).
+    """
+
+    def __init__(self, directory, stem, **header):
+        self.directory = directory
+        self.stem = stem
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.count = 0
+        self.file = tempfile.NamedTemporaryFile('wb', dir=directory, prefix='.tmp-', delete=False)
+        # Written as {**header, "items": [...]}, one item at a time.
+        opening = json.dumps(header, cls=DjangoJSONEncoder, separators=(',', ':'))[:-1]
+        self._write(opening + (',' if header else '') + '"items":[')
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self.file.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+    def add(self, item):
+        self._write((',' if self.count else '') + json.dumps(item, cls=DjangoJSONEncoder, separators=(',', ':')))
+        self.count += 1
+
+    def close(self):
+        """Finish the document; returns ``(manifest entry, written)``."""
+        self._write(']}')
+        self.file.close()
+        content_hash = self.digest.hexdigest()[:HASH_LENGTH]
+        name = f'{self.stem}.{content_hash}.json'
+        target = os.path.join(self.directory, name)
+        written = not os.path.exists(target)
+        if written:
+            os.chmod(self.file.name, 0o644)
+            os.replace(self.file.name, target)
+        else:
+            os.unlink(self.file.name)
+        entry = {
+            'path': f'{SHARD_DIR}/{name}',
+            'hash': content_hash,
+            'count': self.count,
+            'bytes': self.size,
+        }
+        return entry, written
+
+
+class Command(BaseCommand):
+    help = 'Write the active catalog as content-hashed, sharded JSON files for CDN hosting'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=getattr(settings, 'CATALOG_SNAPSHOT_ROOT', None)
+                            or os.path.join(settings.BASE_DIR, 'catalog_snapshot'),
+                            help='Directory to write manifest.json and shards/ into')
+        parser.add_argument('--base-url', default=None,
+                            help='Public API origin for image URLs (default: https://RENDER_EXTERNAL_HOSTNAME, '
+                                 'else http://<first ALLOWED_HOST>)')
+        parser.add_argument('--prune', action='store_true',
+                            help='Delete shard files that the new manifest no longer references')
+
+    def get_request(self, base_url):
+        if base_url is None:
+            if settings.RENDER_EXTERNAL_HOSTNAME:
+                base_url = f'https://{settings.RENDER_EXTERNAL_HOSTNAME}'
+            else:
+                base_url = f'http://{settings.ALLOWED_HOSTS[0]}'
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            raise CommandError(f'Invalid --base-url: {base_url}')
+        return RequestFactory().get('/', HTTP_HOST=parts.netloc, secure=parts.scheme == 'https')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        shard_dir = os.path.join(output, SHARD_DIR)
+        os.makedirs(shard_dir, exist_ok=True)
+        request = self.get_request(options['base_url'])
+        serializer = ProductValuesSerializer((), request)
+        shards = {}
+        written = 0
+
+        def finish(key, writer):
+            nonlocal written
+            shards[key], changed = writer.close()
+            written += changed
+
+        categories = list(Category.objects.filter(is_active=True).order_by('name'))
+        writer = ShardWriter(shard_dir, 'categories')
+        for data in CategorySerializer(categories, many=True, context={'request': request}).data:
+            writer.add(data)
+        finish('categories', writer)
+
+        products = ProductValuesSerializer.values(
+            Product.objects.filter(is_available=True, category__is_active=True)
+        )
+
+        # One pass over the catalog fills the index and every category shard;
+        # rows arrive grouped by category, so only one shard is open at a time.
+        index = ShardWriter(shard_dir, 'index')
+        by_category = {category.pk: category for category in categories}
+        current = current_id = None
+        rows = products.order_by('category_id', '-created_at', 'id').iterator(chunk_size=2000)
+        for row, data in serializer.stream(rows):
+            if row['category_id'] != current_id:
+                if current is not None:
+                    finish(f'category:{by_category[current_id].slug}', current)
+                current_id = row['category_id']
+                slug = by_category[current_id].slug
+                current = ShardWriter(shard_dir, f'category-{slug}', category=slug)
+            current.add(data)
+            index.add({
+                'id': data['id'],
+                'slug': data['slug'],
+                'name': data['name'],
+                'price': data['price'],
+                'category': data['category']['slug'],
+                'image_url': data['image_url'],
+                'is_featured': data['is_featured'],
+            })
+        if current is not None:
+            finish(f'category:{by_category[current_id].slug}', current)
+        finish('index', index)
+
+        # Categories without products still get an (empty) shard.
+        for category in categories:
+            key = f'category:{category.slug}'
+            if key not in shards:
+                finish(key, ShardWriter(shard_dir, f'category-{category.slug}', category=category.slug))
+
+        featured = ShardWriter(shard_dir, 'featured')
+        rows = products.filter(is_featured=True).order_by('-created_at', 'id').iterator(chunk_size=2000)
+        for _, data in serializer.stream(rows):
+            featured.add(data)
+        finish('featured', featured)
+
+        version = hashlib.sha256(
+            json.dumps({key: entry['hash'] for key, entry in shards.items()}, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:HASH_LENGTH]
+        manifest_path = os.path.join(output, 'manifest.json')
+        previous = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as stored:
+                previous = json.load(stored).get('version')
+
+        if previous == version:
+            self.stdout.write(self.style.SUCCESS(f'Catalog unchanged (version {version})'))
+        else:
+            manifest = {
+                'version': version,
+                'generated_at': timezone.now().isoformat(),
+                'shards': dict(sorted(shards.items())),
+            }
+            with tempfile.NamedTemporaryFile('w', dir=output, prefix='.tmp-', delete=False, encoding='utf-8') as tmp:
+                json.dump(manifest, tmp, indent=2)
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, manifest_path)
+            self.stdout.write(self.style.SUCCESS(
+                f'Wrote catalog version {version}: {written} of {len(shards)} shards changed'
+            ))
+
+        if options['prune']:
+            referenced = {os.path.basename(entry['path']) for entry in shards.values()}
+            removed = 0
+            for name in os.listdir(shard_dir):
+                if name.endswith('.json') and name not in referenced:
+                    os.unlink(os.path.join(shard_dir, name))
+                    removed += 1
+            self.stdout.write(f'Pruned {removed} unreferenced shards')
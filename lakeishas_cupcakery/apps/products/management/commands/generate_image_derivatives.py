@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.images import derivative_widths, manifest_name, registry, render_derivatives, save_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive derivatives for existing product, category, blog and profile images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of worker processes (default: CPU count)')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate derivatives that already exist')
+
+    def collect_names(self, force):
+        names = set()
+        for model, field_name in registry:
+            names.update(
+                model._default_manager
+                .exclude(**{f'{field_name}__isnull': True})
+                .exclude(**{field_name: ''})
+                .values_list(field_name, flat=True)
+                .iterator()
+            )
+        if not force:
+            names = {name for name in names if not default_storage.exists(manifest_name(name))}
+        return sorted(names)
+
+    def handle(self, *args, **options):
+        names = self.collect_names(options['force'])
+        if not names:
+            self.stdout.write(self.style.SUCCESS('All images already have derivatives'))
+            return
+
+        workers = max(1, options['workers'])
+        widths = derivative_widths()
+        self.stdout.write(f'Generating derivatives for {len(names)} images with {workers} workers...')
+
+        done = failed = 0
+        pending = {}
+        queue = iter(names)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Keep a bounded number of originals in flight to cap memory.
+                while len(pending) < workers * 2:
+                    name = next(queue, None)
+                    if name is None:
+                        break
+                    try:
+                        with default_storage.open(name, 'rb') as original:
+                            data = original.read()
+                    except OSError as exc:
+                        failed += 1
+                        self.stdout.write(self.style.WARNING(f'Skipped {name}: {exc}'))
+                        continue
+                    pending[pool.submit(render_derivatives, data, widths)] = name
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = pending.pop(future)
+                    try:
+                        save_derivatives(name, future.result())
+                        done += 1
+                    except Exception as exc:
+                        failed += 1
+                        self.stdout.write(self.style.WARNING(f'Failed {name}: {exc}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Generated derivatives for {done} images ({failed} failed)'))
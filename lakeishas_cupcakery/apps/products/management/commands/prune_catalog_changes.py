@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.products.changes import prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Delete delta-sync log rows older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Retention in days (default: CATALOG_CHANGES_RETENTION_DAYS or 30)')
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} catalog change rows'))
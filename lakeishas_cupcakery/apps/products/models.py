@@ -40,6 +40,10 @@ class Product(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs keyset pagination on (-created_at, id).
+            models.Index(fields=['-created_at', 'id'], name='product_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -47,4 +51,37 @@ class Product(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class CatalogChange(models.Model):
+    """
+    Append-only log of catalog writes, read by the delta-sync endpoint.
+
+    Only the kind and id of the changed row are recorded; the sync response
+    loads the current state, so repeated edits of one product cost one row
+    each here but appear once in the response.
+    """
+    KIND_PRODUCT = 'product'
+    KIND_CATEGORY = 'category'
+    KIND_CHOICES = [
+        (KIND_PRODUCT, 'Product'),
+        (KIND_CATEGORY, 'Category'),
+    ]
+
+    ACTION_UPSERT = 'upsert'
+    ACTION_DELETE = 'delete'
+    ACTION_CHOICES = [
+        (ACTION_UPSERT, 'Created or updated'),
+        (ACTION_DELETE, 'Deleted'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} {self.action}"
@@ -0,0 +1,147 @@
+# lakeishas_cupcakery/apps/products/pagination.py
+import base64
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class ProductKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over the catalog ordering ``(-created_at, id)``.
+
+    Each page is a single indexed range scan: there is no COUNT(*) and no
+    OFFSET, so page 10,000 costs the same as page 1. Cursors are opaque,
+    forward-only tokens that encode the last row of the previous page.
+    The order is fixed, so ``?ordering=`` is rejected with 400 rather than
+    silently ignored.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+    ordering_query_param = api_settings.ORDERING_PARAM
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, obj):
+        # Pages may hold model instances or ``.values()`` rows.
+        if isinstance(obj, dict):
+            created_at, pk = obj['created_at'], obj['id']
+        else:
+            created_at, pk = obj.created_at, obj.pk
+        raw = f'{created_at.isoformat()}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            created_at, pk = raw.split('|', 1)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if self.ordering_query_param in request.query_params:
+            raise ValidationError({
+                self.ordering_query_param: 'Cursor pages are always ordered newest first; drop this parameter.'
+            })
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            created_at, pk = position
+            # The redundant ``created_at__lte`` bound gives the planner an
+            # index range to start from; the OR only resolves ties.
+            queryset = queryset.filter(created_at__lte=created_at).filter(
+                Q(created_at__lt=created_at) |
+                Q(created_at=created_at, id__gt=pk)
+            )
+
+        # Fetch one extra row to find out whether there is a next page.
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ProductCatalogPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode.
+
+    Existing clients keep getting ``count``/``next``/``previous`` pages.
+    Clients that send ``?pagination=cursor`` (or follow a ``next`` link that
+    carries ``?cursor=``) are served by :class:`ProductKeysetPagination`.
+    """
+    mode_query_param = 'pagination'
+    keyset_class = ProductKeysetPagination
+
+    def is_cursor_request(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == 'cursor' or
+            self.keyset_class.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_request(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view=view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class ProductSearchPagination(PageNumberPagination):
+    """Page-number pagination for ranked search results."""
+    page_size_query_param = 'page_size'
+    max_page_size = 50
@@ -0,0 +1,352 @@
+# lakeishas_cupcakery/apps/products/search.py
+"""
+Ranked full-text search over the product catalog.
+
+The search index is maintained by the database itself so that every write
+path (``Product.save``, ``bulk_create``, ``QuerySet.update``, raw SQL and
+category renames) keeps it in sync:
+
+* PostgreSQL: a ``search_vector`` tsvector column on ``products_product``
+  filled by a BEFORE trigger and indexed with GIN.
+* SQLite: an FTS5 shadow table ``products_product_fts`` (rowid = product id)
+  filled by AFTER triggers, which are detached while migrations run.
+
+Other backends fall back to the old ``icontains`` scan without ranking.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+TEXT_SEARCH_CONFIG = 'english'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+# The database wraps matches in these private-use characters; the text is
+# HTML-escaped before they are swapped for the real tags (see mark_up).
+MATCH_START = '\ue000'
+MATCH_STOP = '\ue001'
+
+POSTGRES_INSTALL_SQL = [
+    "ALTER TABLE products_product ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION products_product_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(
+                (SELECT name FROM products_category WHERE id = NEW.category_id), '')), 'B') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product",
+    """
+    CREATE TRIGGER products_product_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, category_id ON products_product
+    FOR EACH ROW EXECUTE FUNCTION products_product_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION products_category_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE products_product SET name = name WHERE category_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS products_category_search_vector_trigger ON products_category",
+    """
+    CREATE TRIGGER products_category_search_vector_trigger
+    AFTER UPDATE OF name ON products_category
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION products_category_search_vector_update()
+    """,
+    "CREATE INDEX IF NOT EXISTS products_product_search_gin ON products_product USING gin (search_vector)",
+]
+
+POSTGRES_BACKFILL_SQL = "UPDATE products_product SET name = name WHERE search_vector IS NULL"
+
+POSTGRES_UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS products_category_search_vector_trigger ON products_category",
+    "DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product",
+    "DROP FUNCTION IF EXISTS products_category_search_vector_update()",
+    "DROP FUNCTION IF EXISTS products_product_search_vector_update()",
+    "DROP INDEX IF EXISTS products_product_search_gin",
+    "ALTER TABLE products_product DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FTS_ROW = """
+    INSERT INTO products_product_fts(rowid, name, description, category_name)
+    VALUES (new.id, new.name, new.description,
+            (SELECT name FROM products_category WHERE id = new.category_id));
+"""
+
+SQLITE_INSTALL_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_product_fts
+    USING fts5(name, description, category_name, tokenize = 'porter unicode61')
+    """,
+]
+
+SQLITE_UNINSTALL_SQL = [
+    "DROP TABLE IF EXISTS products_product_fts",
+]
+
+SQLITE_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_product_fts_insert
+    AFTER INSERT ON products_product BEGIN {SQLITE_FTS_ROW} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_product_fts_update
+    AFTER UPDATE OF name, description, category_id ON products_product BEGIN
+        DELETE FROM products_product_fts WHERE rowid = old.id;
+        {SQLITE_FTS_ROW}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_product_fts_delete
+    AFTER DELETE ON products_product BEGIN
+        DELETE FROM products_product_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_category_fts_update
+    AFTER UPDATE OF name ON products_category WHEN old.name IS NOT new.name BEGIN
+        UPDATE products_product_fts SET category_name = new.name
+        WHERE rowid IN (SELECT id FROM products_product WHERE category_id = new.id);
+    END
+    """,
+]
+
+SQLITE_REBUILD_SQL = [
+    "DELETE FROM products_product_fts",
+    """
+    INSERT INTO products_product_fts(rowid, name, description, category_name)
+    SELECT p.id, p.name, p.description, c.name
+    FROM products_product p JOIN products_category c ON c.id = p.category_id
+    """,
+]
+
+SQLITE_DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS products_category_fts_update",
+    "DROP TRIGGER IF EXISTS products_product_fts_delete",
+    "DROP TRIGGER IF EXISTS products_product_fts_update",
+    "DROP TRIGGER IF EXISTS products_product_fts_insert",
+]
+
+
+def _execute_all(conn, statements):
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(conn=connection):
+    """
+    Create the search column or FTS table. On PostgreSQL this also installs
+    the triggers and indexes existing rows; on SQLite the triggers are
+    attached after ``migrate`` instead (see :func:`attach_sqlite_triggers`).
+    """
+    if conn.vendor == 'postgresql':
+        _execute_all(conn, POSTGRES_INSTALL_SQL + [POSTGRES_BACKFILL_SQL])
+    elif conn.vendor == 'sqlite':
+        _execute_all(conn, SQLITE_INSTALL_SQL)
+
+
+def uninstall_search_index(conn=connection):
+    if conn.vendor == 'postgresql':
+        _execute_all(conn, POSTGRES_UNINSTALL_SQL)
+    elif conn.vendor == 'sqlite':
+        _execute_all(conn, SQLITE_DROP_TRIGGER_SQL + SQLITE_UNINSTALL_SQL)
+
+
+def sqlite_search_index_exists(conn=connection):
+    return conn.vendor == 'sqlite' and 'products_product_fts' in conn.introspection.table_names()
+
+
+def attach_sqlite_triggers(conn=connection):
+    """
+    Install the FTS triggers and rebuild the index from the product table.
+
+    SQLite triggers that reference another table make Django's table rebuilds
+    fail during migrations, so they only exist between ``migrate`` runs.
+    """
+    _execute_all(conn, SQLITE_TRIGGER_SQL + SQLITE_REBUILD_SQL)
+
+
+def detach_sqlite_triggers(conn=connection):
+    _execute_all(conn, SQLITE_DROP_TRIGGER_SQL)
+
+
+def mark_up(text):
+    """HTML-escape highlighted text from the index and turn its match markers into ``<mark>`` tags."""
+    if text is None:
+        return None
+    return escape(text).replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+
+class SearchHit:
+    """One ranked match: the product id plus its score and highlighted text."""
+    __slots__ = ('product_id', 'rank', 'name', 'snippet')
+
+    def __init__(self, product_id, rank, name, snippet):
+        self.product_id = product_id
+        self.rank = rank
+        self.name = name
+        self.snippet = snippet
+
+
+class PostgresProductSearch:
+    count_sql = """
+        SELECT count(*) FROM products_product
+        WHERE is_available AND search_vector @@ websearch_to_tsquery(%s, %s)
+    """
+    # Rank and LIMIT first, then run the (expensive) ts_headline on the page only.
+    page_sql = """
+        SELECT hits.id, hits.rank,
+               ts_headline(%s, p.name, hits.query, %s),
+               ts_headline(%s, p.description, hits.query, %s)
+        FROM (
+            SELECT id, ts_rank_cd(search_vector, query) AS rank, query
+            FROM products_product, websearch_to_tsquery(%s, %s) query
+            WHERE is_available AND search_vector @@ query
+            ORDER BY rank DESC, id
+            LIMIT %s OFFSET %s
+        ) hits
+        JOIN products_product p ON p.id = hits.id
+        ORDER BY hits.rank DESC, hits.id
+    """
+    name_options = f'StartSel={MATCH_START}, StopSel={MATCH_STOP}, HighlightAll=true'
+    snippet_options = (
+        f'StartSel={MATCH_START}, StopSel={MATCH_STOP}, '
+        'MaxFragments=1, MaxWords=24, MinWords=8'
+    )
+
+    def __init__(self, query):
+        self.query = query
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(self.count_sql, [TEXT_SEARCH_CONFIG, self.query])
+            return cursor.fetchone()[0]
+
+    def fetch(self, offset, limit):
+        params = [
+            TEXT_SEARCH_CONFIG, self.name_options,
+            TEXT_SEARCH_CONFIG, self.snippet_options,
+            TEXT_SEARCH_CONFIG, self.query,
+            limit, offset,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(self.page_sql, params)
+            return [
+                SearchHit(pk, rank, mark_up(name), mark_up(snippet))
+                for pk, rank, name, snippet in cursor.fetchall()
+            ]
+
+
+class SQLiteProductSearch:
+    # bm25() weights follow the column order: name, description, category_name.
+    # Lower bm25 scores are better, so they are negated into a "higher is better" rank.
+    count_sql = """
+        SELECT count(*) FROM products_product_fts f
+        JOIN products_product p ON p.id = f.rowid
+        WHERE products_product_fts MATCH %s AND p.is_available
+    """
+    page_sql = f"""
+        SELECT f.rowid, -bm25(products_product_fts, 10.0, 1.0, 4.0) AS rank,
+               highlight(products_product_fts, 0, '{MATCH_START}', '{MATCH_STOP}'),
+               snippet(products_product_fts, 1, '{MATCH_START}', '{MATCH_STOP}', '…', 24)
+        FROM products_product_fts f
+        JOIN products_product p ON p.id = f.rowid
+        WHERE products_product_fts MATCH %s AND p.is_available
+        ORDER BY rank DESC, f.rowid
+        LIMIT %s OFFSET %s
+    """
+
+    def __init__(self, query):
+        self.match = self.to_match_expression(query)
+
+    @staticmethod
+    def to_match_expression(query):
+        """
+        Turn free text into a safe FTS5 expression: every word is quoted (so
+        FTS5 operators in user input are inert) and the last one is a prefix.
+        """
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def count(self):
+        if self.match is None:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(self.count_sql, [self.match])
+            return cursor.fetchone()[0]
+
+    def fetch(self, offset, limit):
+        if self.match is None:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(self.page_sql, [self.match, limit, offset])
+            return [
+                SearchHit(pk, rank, mark_up(name), mark_up(snippet))
+                for pk, rank, name, snippet in cursor.fetchall()
+            ]
+
+
+class ScanProductSearch:
+    """Unranked ``icontains`` scan for databases without a search index."""
+
+    def __init__(self, query):
+        from .models import Product
+        self.queryset = Product.objects.filter(is_available=True).filter(
+            Q(name__icontains=query) |
+            Q(description__icontains=query) |
+            Q(category__name__icontains=query)
+        ).order_by('-created_at', 'id')
+
+    def count(self):
+        return self.queryset.count()
+
+    def fetch(self, offset, limit):
+        ids = self.queryset.values_list('id', flat=True)[offset:offset + limit]
+        return [SearchHit(pk, None, None, None) for pk in ids]
+
+
+class ProductSearchResults:
+    """
+    Lazy, sliceable result set for a search query.
+
+    It implements ``count()`` and slicing so it can be handed straight to
+    Django's ``Paginator`` (and therefore to DRF pagination classes); only the
+    requested page is ever fetched from the index.
+    """
+
+    def __init__(self, query):
+        backend = {
+            'postgresql': PostgresProductSearch,
+            'sqlite': SQLiteProductSearch,
+        }.get(connection.vendor, ScanProductSearch)
+        self.backend = backend(query)
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.backend.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start = key.start or 0
+            stop = key.stop if key.stop is not None else self.count()
+            return self.backend.fetch(start, max(stop - start, 0))
+        return self.backend.fetch(key, 1)[0]
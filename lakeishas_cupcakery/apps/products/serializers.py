@@ -1,14 +1,22 @@
 # lakeishas_cupcakery/apps/products/serializers.py
+from itertools import islice
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
+from core.images import ImageVariantsField, get_manifest, get_manifests, image_variants
+from core.mixins import SparseFieldsetSerializerMixin
 from .models import Product, Category
 
 class CategorySerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField(source='image')
+
     class Meta:
         model = Category
-        fields = ['id', 'name', 'slug', 'description', 'image', 'is_active']
+        fields = ['id', 'name', 'slug', 'description', 'image', 'image_variants', 'is_active']
         read_only_fields = ['slug']
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(),
@@ -16,17 +24,187 @@ class ProductSerializer(serializers.ModelSerializer):
         write_only=True
     )
     image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Product
         fields = [
             'id', 'name', 'slug', 'description', 'price', 
-            'category', 'category_id', 'image', 'image_url',
+            'category', 'category_id', 'image', 'image_url', 'image_variants',
             'is_featured', 'is_available', 'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'created_at', 'updated_at']
 
+    collapsed_fields = {'category': lambda: serializers.PrimaryKeyRelatedField(read_only=True)}
+    method_field_sources = {'image_url': ('image',)}
+
     def get_image_url(self, obj):
         if obj.image:
             return self.context['request'].build_absolute_uri(obj.image.url)
-        return None
\ No newline at end of file
+        return None
+
+class ProductValuesSerializer:
+    """
+    Read-only fast path for product list endpoints.
+
+    Renders the same JSON as ``ProductSerializer`` from ``.values()`` rows
+    instead of model instances: only the needed columns are fetched, each
+    category is rendered once per response, the absolute media URL prefix
+    is built once per request instead of once per image, and the image
+    derivative manifests for a page come from one cache lookup.
+    """
+    values_fields = (
+        'id', 'name', 'slug', 'description', 'price', 'image',
+        'is_featured', 'is_available', 'created_at', 'updated_at',
+        'category_id', 'category__name', 'category__slug',
+        'category__description', 'category__image', 'category__is_active',
+    )
+    # Output field -> the values_fields it is rendered from, for ?fields=.
+    field_columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'slug': ('slug',),
+        'description': ('description',),
+        'price': ('price',),
+        'category': (
+            'category_id', 'category__name', 'category__slug',
+            'category__description', 'category__image', 'category__is_active',
+        ),
+        'image': ('image',),
+        'image_url': ('image',),
+        'image_variants': ('image',),
+        'is_featured': ('is_featured',),
+        'is_available': ('is_available',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+    }
+
+    def __init__(self, rows, request, fields=None, expand=None):
+        self.rows = rows
+        self.request = request
+        self.price_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+        self.datetime_field = serializers.DateTimeField()
+        self._categories = {}
+        self._media_prefix = None
+        self._manifests = {}
+        self.output_fields = None
+        if fields is not None or expand is not None:
+            self.output_fields = [name for name in self.field_columns if fields is None or name in fields]
+        self.expand_category = expand is None or 'category' in expand
+
+    @classmethod
+    def values(cls, queryset, fields=None, expand=None):
+        if fields is None and expand is None:
+            return queryset.values(*cls.values_fields)
+        # id and created_at are always fetched: keyset cursors are built from them.
+        columns = ['id', 'created_at']
+        for name, names in cls.field_columns.items():
+            if fields is not None and name not in fields:
+                continue
+            if name == 'category' and expand is not None and name not in expand:
+                names = ('category_id',)
+            columns.extend(column for column in names if column not in columns)
+        return queryset.values(*columns)
+
+    def media_prefix(self):
+        """Absolute ``MEDIA_URL`` for file system storage, else ``None``."""
+        if not isinstance(default_storage, FileSystemStorage):
+            return None
+        if self._media_prefix is None:
+            self._media_prefix = self.request.build_absolute_uri(default_storage.base_url)
+        return self._media_prefix
+
+    def media_url(self, name):
+        if not name:
+            return None
+        prefix = self.media_prefix()
+        if prefix is not None:
+            return prefix + filepath_to_uri(name).lstrip('/')
+        return self.request.build_absolute_uri(default_storage.url(name))
+
+    def image_variants(self, name):
+        if not name:
+            return None
+        if name not in self._manifests:
+            self._manifests[name] = get_manifest(name)
+        return image_variants(name, self.request, manifest=self._manifests[name], url_prefix=self.media_prefix())
+
+    def category(self, row):
+        category_id = row['category_id']
+        data = self._categories.get(category_id)
+        if data is None:
+            data = self._categories[category_id] = {
+                'id': category_id,
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+                'description': row['category__description'],
+                'image': self.media_url(row['category__image']),
+                'image_variants': self.image_variants(row['category__image']),
+                'is_active': row['category__is_active'],
+            }
+        return data
+
+    def render_field(self, name, row):
+        if name == 'price':
+            return self.price_field.to_representation(row['price'])
+        if name in ('image', 'image_url'):
+            return self.media_url(row['image'])
+        if name == 'image_variants':
+            return self.image_variants(row['image'])
+        if name == 'category':
+            return self.category(row) if self.expand_category else row['category_id']
+        if name in ('created_at', 'updated_at'):
+            return self.datetime_field.to_representation(row[name])
+        return row[name]
+
+    def to_representation(self, row):
+        if self.output_fields is not None:
+            return {name: self.render_field(name, row) for name in self.output_fields}
+        image = self.media_url(row['image'])
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'slug': row['slug'],
+            'description': row['description'],
+            'price': self.price_field.to_representation(row['price']),
+            'category': self.category(row),
+            'image': image,
+            'image_url': image,
+            'image_variants': self.image_variants(row['image']),
+            'is_featured': row['is_featured'],
+            'is_available': row['is_available'],
+            'created_at': self.datetime_field.to_representation(row['created_at']),
+            'updated_at': self.datetime_field.to_representation(row['updated_at']),
+        }
+
+    def prefetch_manifests(self, rows):
+        wanted = self.output_fields if self.output_fields is not None else self.field_columns
+        columns = []
+        if 'image_variants' in wanted:
+            columns.append('image')
+        if 'category' in wanted and self.expand_category:
+            columns.append('category__image')
+        names = {row[column] for row in rows for column in columns if row.get(column)}
+        self._manifests.update(get_manifests(names - self._manifests.keys()))
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+        self.prefetch_manifests(rows)
+        return [self.to_representation(row) for row in rows]
+
+    def stream(self, rows, batch_size=2000):
+        """
+        Yield ``(row, data)`` for an iterable of rows of any length. Manifests
+        are fetched per batch and dropped before the next one, so memory stays
+        bounded by ``batch_size`` rather than by the number of images.
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            self._manifests.clear()
+            self.prefetch_manifests(batch)
+            for row in batch:
+                yield row, self.to_representation(row)
@@ -0,0 +1,49 @@
+# lakeishas_cupcakery/apps/products/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.home import invalidate_home_bundle_on_change
+from core.images import register_image_derivatives
+
+from . import suggest
+from .changes import record_change
+from .models import CatalogChange, Category, Product
+
+register_image_derivatives(Product, 'image')
+register_image_derivatives(Category, 'image')
+invalidate_home_bundle_on_change(Product, Category)
+
+
+@receiver(post_save, sender=Product)
+def update_product_suggestions(sender, instance, **kwargs):
+    """Keep this worker's type-ahead index in step with committed product edits."""
+    transaction.on_commit(lambda pk=instance.pk: suggest.refresh_product(pk))
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(lambda pk=instance.pk: suggest.remove_suggestion('product', pk))
+
+
+@receiver(post_save, sender=Category)
+def update_category_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(lambda pk=instance.pk: suggest.refresh_category(pk))
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(lambda pk=instance.pk: suggest.remove_suggestion('category', pk))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+def log_catalog_save(sender, instance, **kwargs):
+    """Feed the delta-sync log; soft deletes (is_active=False) are saves too."""
+    record_change(instance, CatalogChange.ACTION_UPSERT)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+def log_catalog_delete(sender, instance, **kwargs):
+    record_change(instance, CatalogChange.ACTION_DELETE)
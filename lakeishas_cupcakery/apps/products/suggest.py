@@ -0,0 +1,222 @@
+# lakeishas_cupcakery/apps/products/suggest.py
+"""
+In-memory type-ahead index for product and category names.
+
+Each worker process keeps one :class:`SuggestionIndex`, built lazily on the
+first lookup and then patched after each committed ``post_save``/``post_delete``
+in ``signals.py`` (rolled-back writes never reach it). It holds what the
+storefront lists: active categories and available products in them. Lookups
+never touch the database:
+
+* a sorted array of ``(term, key)`` pairs answers prefix queries with a
+  binary search (every word of a name is a term, so "fudge" finds
+  "Chocolate fudge cupcake");
+* trigram postings catch typos and infix matches when prefixes run out.
+
+Writes handled by other workers are not seen by this process, so the index
+is also rebuilt once it is older than ``PRODUCT_SUGGEST_MAX_AGE`` seconds.
+"""
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, namedtuple
+
+from django.conf import settings
+
+Suggestion = namedtuple('Suggestion', ['type', 'id', 'name', 'slug'])
+
+MIN_TRIGRAM_SIMILARITY = 0.3
+# Trigrams shared by more entries than this carry little signal and are
+# skipped when scoring fuzzy matches, which keeps lookups sub-millisecond.
+MAX_POSTINGS_SCANNED = 2000
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r'[\W_]+', ' ', text.lower()).strip()
+
+
+def trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SuggestionIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._terms = {}
+        self._prefixes = []
+        self._postings = {}
+        self.built_at = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _terms_for(suggestion):
+        name = normalize(suggestion.name)
+        words = name.split()
+        # Every word suffix of the name, plus the slug, is searchable by prefix.
+        terms = {' '.join(words[i:]) for i in range(len(words))}
+        terms.add(normalize(suggestion.slug))
+        terms.discard('')
+        return terms
+
+    def add(self, suggestion):
+        key = (suggestion.type, suggestion.id)
+        with self._lock:
+            self.remove(*key)
+            terms = self._terms_for(suggestion)
+            self._entries[key] = suggestion
+            self._terms[key] = terms
+            for term in terms:
+                bisect.insort(self._prefixes, (term, key))
+            for gram in trigrams(normalize(suggestion.name)):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, kind, pk):
+        key = (kind, pk)
+        with self._lock:
+            suggestion = self._entries.pop(key, None)
+            if suggestion is None:
+                return
+            for term in self._terms.pop(key):
+                i = bisect.bisect_left(self._prefixes, (term, key))
+                if i < len(self._prefixes) and self._prefixes[i] == (term, key):
+                    del self._prefixes[i]
+            for gram in trigrams(normalize(suggestion.name)):
+                keys = self._postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._postings[gram]
+
+    def load(self, suggestions):
+        """Replace the whole index in one pass (sorting once instead of insort)."""
+        entries, terms, prefixes, postings = {}, {}, [], {}
+        for suggestion in suggestions:
+            key = (suggestion.type, suggestion.id)
+            entries[key] = suggestion
+            terms[key] = self._terms_for(suggestion)
+            prefixes.extend((term, key) for term in terms[key])
+            for gram in trigrams(normalize(suggestion.name)):
+                postings.setdefault(gram, set()).add(key)
+        prefixes.sort()
+        with self._lock:
+            self._entries, self._terms = entries, terms
+            self._prefixes, self._postings = prefixes, postings
+            self.built_at = time.monotonic()
+
+    def lookup(self, query, limit=8):
+        query = normalize(query)
+        if not query:
+            return []
+        with self._lock:
+            found = []
+            seen = set()
+            i = bisect.bisect_left(self._prefixes, (query,))
+            while i < len(self._prefixes) and len(found) < limit:
+                term, key = self._prefixes[i]
+                if not term.startswith(query):
+                    break
+                if key not in seen:
+                    seen.add(key)
+                    found.append(self._entries[key])
+                i += 1
+            if len(found) < limit:
+                found.extend(self._fuzzy(query, limit - len(found), seen))
+            return found
+
+    def _fuzzy(self, query, limit, seen):
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            keys = self._postings.get(gram, ())
+            if len(keys) > MAX_POSTINGS_SCANNED:
+                continue
+            for key in keys:
+                if key not in seen:
+                    shared[key] += 1
+        ranked = [
+            (count / len(grams), key)
+            for key, count in shared.items()
+            if count / len(grams) >= MIN_TRIGRAM_SIMILARITY
+        ]
+        ranked.sort(key=lambda item: (-item[0], self._entries[item[1]].name))
+        return [self._entries[key] for _, key in ranked[:limit]]
+
+
+def visible_products():
+    """Products the storefront lists: available, in an active category."""
+    from .models import Product
+    return Product.objects.filter(is_available=True, category__is_active=True)
+
+
+def load_suggestions():
+    from .models import Category
+
+    for row in Category.objects.filter(is_active=True).values_list('id', 'name', 'slug'):
+        yield Suggestion('category', *row)
+    rows = visible_products().values_list('id', 'name', 'slug')
+    for row in rows.iterator(chunk_size=2000):
+        yield Suggestion('product', *row)
+
+
+_index = SuggestionIndex()
+_build_lock = threading.Lock()
+
+
+def get_suggestion_index():
+    """Return this process's index, building or refreshing it if needed."""
+    max_age = getattr(settings, 'PRODUCT_SUGGEST_MAX_AGE', 300)
+    if _index.built_at is None or time.monotonic() - _index.built_at > max_age:
+        with _build_lock:
+            if _index.built_at is None or time.monotonic() - _index.built_at > max_age:
+                _index.load(load_suggestions())
+    return _index
+
+
+def is_index_built():
+    return _index.built_at is not None
+
+
+def refresh_product(pk):
+    """Re-read one product after a committed write and add or drop its suggestion."""
+    if not is_index_built():
+        return
+    row = visible_products().filter(pk=pk).values_list('id', 'name', 'slug').first()
+    if row is None:
+        _index.remove('product', pk)
+    else:
+        _index.add(Suggestion('product', *row))
+
+
+def refresh_category(pk):
+    """
+    Re-read one category after a committed write. Its products are synced
+    too, since (de)activating a category shows or hides all of them.
+    """
+    from .models import Category, Product
+
+    if not is_index_built():
+        return
+    row = Category.objects.filter(pk=pk, is_active=True).values_list('id', 'name', 'slug').first()
+    if row is None:
+        _index.remove('category', pk)
+    else:
+        _index.add(Suggestion('category', *row))
+    products = Product.objects.filter(category_id=pk).values_list('id', 'name', 'slug', 'is_available')
+    for product_id, name, slug, available in products.iterator(chunk_size=2000):
+        if row is not None and available:
+            _index.add(Suggestion('product', product_id, name, slug))
+        else:
+            _index.remove('product', product_id)
+
+
+def remove_suggestion(kind, pk):
+    if is_index_built():
+        _index.remove(kind, pk)
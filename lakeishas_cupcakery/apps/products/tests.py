@@ -1,3 +1,117 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .models import Category, Product
+
+
+def create_products(count, per_timestamp=1):
+    """``count`` products; every ``per_timestamp`` of them share one ``created_at``."""
+    category = Category.objects.create(name='Cupcakes', slug='cupcakes')
+    Product.objects.bulk_create(
+        Product(
+            name=f'Cupcake {n}', slug=f'cupcake-{n}', description=f'Cupcake number {n}.',
+            price=Decimal('3.50'), category=category, image='products/cupcake.jpg',
+            is_featured=(n % 3 == 0),
+        )
+        for n in range(count)
+    )
+    start = timezone.now() - timedelta(days=1)
+    for n, pk in enumerate(Product.objects.order_by('id').values_list('id', flat=True)):
+        Product.objects.filter(pk=pk).update(created_at=start + timedelta(minutes=n // per_timestamp))
+    return category
+
+
+class ProductKeysetPaginationTests(APITestCase):
+    url = '/api/products/'
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products(23, per_timestamp=4)
+
+    def expected_ids(self):
+        return list(Product.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+
+    def walk(self, **params):
+        response = self.client.get(self.url, {'pagination': 'cursor', **params})
+        pages = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            pages.append([item['id'] for item in response.data['results']])
+            if response.data['next'] is None:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_pages_cover_every_product_once_in_catalog_order(self):
+        pages = self.walk(page_size=5)
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        # Several products share each created_at, so pages split ties by id.
+        self.assertEqual([pk for page in pages for pk in page], self.expected_ids())
+
+    def test_exact_multiple_of_page_size_has_no_empty_last_page(self):
+        Product.objects.filter(pk=self.expected_ids()[-1]).delete()
+
+        pages = self.walk(page_size=11)
+
+        self.assertEqual([len(page) for page in pages], [11, 11])
+
+    def test_ordering_is_rejected(self):
+        response = self.client.get(self.url, {'pagination': 'cursor', 'ordering': 'price'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.data)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_mode_is_unchanged(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 23)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIn('previous', response.data)
+
+
+class ProductValuesSerializerTests(APITestCase):
+    """The list fast path must render exactly what ProductSerializer renders on the detail route."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products(6)
+        category = Category.objects.create(name='Seasonal', slug='seasonal', image='categories/seasonal.jpg')
+        Product.objects.filter(slug__in=['cupcake-1', 'cupcake-4']).update(category=category, image='')
+
+    def listed(self, **params):
+        response = self.client.get('/api/products/', {'pagination': 'cursor', 'page_size': 50, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def detail(self, slug, **params):
+        response = self.client.get(f'/api/products/{slug}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_matches_model_serializer(self):
+        listed = self.listed()
+
+        self.assertEqual(len(listed), 6)
+        for item in listed:
+            self.assertEqual(item, self.detail(item['slug']))
+
+    def test_sparse_fieldsets_match_model_serializer(self):
+        for params in (
+            {'fields': 'id,slug,price,image_url'},
+            {'fields': 'slug,category', 'expand': ''},
+            {'fields': 'slug,category,image_variants', 'expand': 'category'},
+        ):
+            with self.subTest(**params):
+                for item in self.listed(**params):
+                    self.assertEqual(list(item), params['fields'].split(','))
+                    self.assertEqual(item, self.detail(item['slug'], **params))
@@ -21,6 +21,9 @@ urlpatterns = [
 
     # Search endpoint (must be before slug)
     path('search/', views.ProductSearchView.as_view(), name='product-search'),
+    path('suggest/', views.ProductSuggestView.as_view(), name='product-suggest'),
+    path('changes/', views.CatalogChangesView.as_view(), name='product-changes'),
+    path('featured/', views.FeaturedProductList.as_view({'get': 'list'}), name='product-featured'),
 
     # Main API endpoints (Categories)
     path('', include(router.urls)),
@@ -5,15 +5,35 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
-from .models import Product, Category
-from .serializers import ProductSerializer, CategorySerializer
+from core.mixins import ConditionalGetMixin, SparseFieldsetMixin
+
+from .models import CatalogChange, Product, Category
+from .serializers import ProductSerializer, CategorySerializer, ProductValuesSerializer
 from .permissions import ProductsPermission
+from .pagination import ProductCatalogPagination, ProductSearchPagination
+from .search import ProductSearchResults
+from .suggest import get_suggestion_index
+from .changes import CursorExpired, collect_changes, latest_cursor, split_changes
 from .authentication import SafeJWTAuthentication
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class ProductValuesListMixin(SparseFieldsetMixin):
+    """
+    Serve ``list`` through :class:`ProductValuesSerializer` instead of the
+    ModelSerializer; the JSON is the same but far cheaper to build.
+    ``?fields=``/``?expand=`` narrow both the columns fetched and the output.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fields, expand = self.get_sparse_fieldset()
+        rows = ProductValuesSerializer.values(self.filter_queryset(self.get_queryset()), fields, expand)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(ProductValuesSerializer(page, request, fields, expand).data)
+        return Response(ProductValuesSerializer(rows, request, fields, expand).data)
+
+class CategoryViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows categories to be viewed or edited.
     """
@@ -45,13 +65,21 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def products(self, request, slug=None):
         """
         Get all products in this category.
+
+        Unpaginated by default; ``?pagination=cursor`` switches to keyset pages.
         """
         category = self.get_object()
-        products = Product.objects.filter(category=category, is_available=True)
-        serializer = ProductSerializer(products, many=True, context={'request': request})
-        return Response(serializer.data)
+        fields, expand = self.get_sparse_fieldset()
+        products = ProductValuesSerializer.values(
+            Product.objects.filter(category=category, is_available=True), fields, expand
+        )
+        paginator = ProductCatalogPagination()
+        if paginator.is_cursor_request(request):
+            page = paginator.paginate_queryset(products, request, view=self)
+            return paginator.get_paginated_response(ProductValuesSerializer(page, request, fields, expand).data)
+        return Response(ProductValuesSerializer(products, request, fields, expand).data)
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, ProductValuesListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows products to be viewed or edited.
     """
@@ -65,6 +93,8 @@ class ProductViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['price', 'created_at', 'name']
     ordering = ['-created_at']
+    pagination_class = ProductCatalogPagination
+    related_last_modified_fields = ('category__updated_at',)
     
     authentication_classes = [SafeJWTAuthentication]
 
@@ -94,50 +124,157 @@ class ProductViewSet(viewsets.ModelViewSet):
         product.save()
         return Response({'status': 'featured' if product.is_featured else 'not featured'})
 
-class CategoryProductViewSet(viewsets.ModelViewSet):
+class CategoryProductViewSet(ProductValuesListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows viewing products by category.
     """
     serializer_class = ProductSerializer
     permission_classes = [permissions.AllowAny]  # Allow unauthenticated read access
+    pagination_class = ProductCatalogPagination
     
     def get_queryset(self):
         category_slug = self.kwargs.get('category_slug')
         category = get_object_or_404(Category, slug=category_slug, is_active=True)
         return Product.objects.filter(category=category, is_available=True)
 
-class FeaturedProductList(viewsets.ReadOnlyModelViewSet):
+class FeaturedProductList(ConditionalGetMixin, ProductValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that lists all featured products.
     """
     serializer_class = ProductSerializer
     permission_classes = [permissions.AllowAny]  # Allow unauthenticated read access
     pagination_class = None  # No pagination for featured products
+    related_last_modified_fields = ('category__updated_at',)
     
     def get_queryset(self):
         return Product.objects.filter(is_featured=True, is_available=True).select_related('category')
 
-from rest_framework.views import APIView
-from rest_framework.response import Response
-
 class ProductSearchView(APIView):
     """
     API endpoint that allows searching products.
+
+    Results come from the full-text index (see ``search.py``), ordered by
+    relevance and paginated. Each result carries its ``rank`` and a
+    ``highlight`` with ``<mark>``-tagged name and description snippets.
     """
     permission_classes = [permissions.AllowAny]  # Allow unauthenticated read access
     
     def get(self, request, *args, **kwargs):
         query = request.query_params.get('q', '').strip()
         if not query:
-            return Response([])
-            
-        queryset = Product.objects.filter(
-            is_available=True
-        ).filter(
-            Q(name__icontains=query) | 
-            Q(description__icontains=query) |
-            Q(category__name__icontains=query)
-        ).select_related('category')
-        
-        serializer = ProductSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
\ No newline at end of file
+            return Response({'count': 0, 'next': None, 'previous': None, 'results': []})
+
+        paginator = ProductSearchPagination()
+        hits = paginator.paginate_queryset(ProductSearchResults(query), request, view=self)
+        products = Product.objects.select_related('category').in_bulk(
+            [hit.product_id for hit in hits]
+        )
+        hits = [hit for hit in hits if hit.product_id in products]
+
+        serializer = ProductSerializer(
+            [products[hit.product_id] for hit in hits],
+            many=True,
+            context={'request': request}
+        )
+        results = []
+        for hit, data in zip(hits, serializer.data):
+            data['rank'] = hit.rank
+            data['highlight'] = {'name': hit.name, 'description': hit.snippet}
+            results.append(data)
+        return paginator.get_paginated_response(results)
+
+
+class ProductSuggestView(APIView):
+    """
+    Type-ahead suggestions for product and category names.
+
+    Served from the per-process in-memory index in ``suggest.py``; a lookup
+    does not hit the database.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []  # Public, called on every keystroke
+    default_limit = 8
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        suggestions = get_suggestion_index().lookup(query, limit=limit) if query else []
+        return Response({
+            'query': query,
+            'results': [suggestion._asdict() for suggestion in suggestions],
+        })
+
+
+class CatalogChangesView(APIView):
+    """
+    Delta sync: ``?since=<cursor>`` returns only the products and categories
+    created, updated, deactivated or deleted after the cursor, plus the cursor
+    to send next time (see ``changes.py``).
+
+    Without ``since`` it returns just the current cursor; take it before
+    downloading the full catalog, then poll from it. A ``410 Gone`` means the
+    cursor is no longer covered by the log and the client must resync.
+    Staff see inactive rows in ``updated``; everyone else gets them in
+    ``removed`` alongside deleted ids.
+
+    Changes show up ``CATALOG_CHANGES_SETTLE_SECONDS`` after they commit, and
+    delivery is best effort (see ``changes.py`` for when one can be missed),
+    so clients should still resync the full catalog periodically.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = [SafeJWTAuthentication]
+    default_limit = 500
+    max_limit = 2000
+
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'cursor': str(latest_cursor())})
+        try:
+            since = int(since)
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        try:
+            cursor, has_more, changed = collect_changes(since, limit)
+        except CursorExpired:
+            return Response(
+                {'error': 'Cursor expired; download the full catalog again'},
+                status=status.HTTP_410_GONE
+            )
+
+        staff = request.user.is_staff
+        product_ids, removed_products = split_changes(changed[CatalogChange.KIND_PRODUCT])
+        products = Product.objects.filter(pk__in=product_ids)
+        if not staff:
+            products = products.filter(is_available=True)
+        products = list(ProductValuesSerializer.values(products.order_by('id'))) if product_ids else []
+        removed_products += set(product_ids) - {row['id'] for row in products}
+
+        category_ids, removed_categories = split_changes(changed[CatalogChange.KIND_CATEGORY])
+        categories = Category.objects.filter(pk__in=category_ids)
+        if not staff:
+            categories = categories.filter(is_active=True)
+        categories = list(categories.order_by('id')) if category_ids else []
+        removed_categories += set(category_ids) - {category.pk for category in categories}
+
+        return Response({
+            'cursor': str(cursor),
+            'has_more': has_more,
+            'products': {
+                'updated': ProductValuesSerializer(products, request).data,
+                'removed': sorted(removed_products),
+            },
+            'categories': {
+                'updated': CategorySerializer(categories, many=True, context={'request': request}).data,
+                'removed': sorted(removed_categories),
+            },
+        })
@@ -4,3 +4,6 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     verbose_name = 'Users'
+
+    def ready(self):
+        import apps.users.signals
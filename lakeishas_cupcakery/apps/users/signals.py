@@ -0,0 +1,4 @@
+from core.images import register_image_derivatives
+from .models import User
+
+register_image_derivatives(User, 'profile_picture')
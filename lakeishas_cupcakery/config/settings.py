@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     "django_filters",
 
     # Your apps
+    "core",
     "apps.products",
     "apps.users.apps.UsersConfig",
     "apps.blog",
@@ -62,6 +63,8 @@ INSTALLED_APPS = [
     "apps.reviews",
     "apps.notifications",
     "apps.payments",
+    "apps.admin_dashboard",
+    "apps.analytics",
 ]
 
 # ------------------------------------------------------------
@@ -80,6 +83,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.analytics.middleware.PageViewMiddleware",
 ]
 
 # ------------------------------------------------------------
@@ -161,6 +165,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+# Let the frontend see that a retried POST was answered from the idempotency store.
+CORS_EXPOSE_HEADERS = ["idempotent-replayed"]
 CORS_ALLOW_ALL_ORIGINS = False
 
 CORS_ALLOW_HEADERS = [
@@ -169,6 +175,7 @@ CORS_ALLOW_HEADERS = [
     "authorization",
     "content-type",
     "dnt",
+    "idempotency-key",
     "origin",
     "user-agent",
     "x-csrftoken",
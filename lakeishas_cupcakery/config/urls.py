@@ -21,6 +21,7 @@ from django.conf.urls.static import static
 from django.views.generic import RedirectView
 from django.http import HttpResponse
 from apps.admin_dashboard.views import WelcomeView
+from core.home import HomeView
 import debug_toolbar
 
 # Custom admin site with our dashboard
@@ -42,6 +43,7 @@ urlpatterns = [
     path('admin/original/', admin.site.urls),
     
     # API endpoints
+    path('api/home/', HomeView.as_view(), name='home-bundle'),
     path('api/auth/', include('apps.users.urls')),
     path('api/products/', include('apps.products.urls')),
     path('api/orders/', include('apps.orders.urls')),
@@ -49,6 +51,7 @@ urlpatterns = [
     path('api/contact/', include('apps.contact.urls')),
     path('api/newsletter/', include('apps.newsletter.urls')),
     path('api/reviews/', include('apps.reviews.urls')),
+    path('api/analytics/', include('apps.analytics.urls')),
 ]
 
 # Serve media files in development
@@ -0,0 +1,16 @@
+from functools import wraps
+
+from .idempotency import run_idempotent
+
+
+def idempotent(handler):
+    """
+    Run a DRF view handler (``post``, ``create``, ...) at most once per
+    ``Idempotency-Key`` header; see ``core/idempotency.py``. Requests
+    without the header are handled as before.
+    """
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        scope = f'{type(self).__module__}.{type(self).__qualname__}'
+        return run_idempotent(scope, request, lambda: handler(self, request, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,209 @@
+"""
+Streaming table exports (CSV, NDJSON, JSON, XLSX).
+
+An export is a list of column headers plus an iterable of row tuples, usually
+built lazily from ``queryset.iterator(chunk_size=...)``. Every format is
+produced by a generator that is handed to :class:`StreamingHttpResponse`, so
+the first bytes go out as soon as the first chunk of rows is read and memory
+stays flat however many rows follow.
+
+XLSX is written directly as SpreadsheetML into a zip stream (no workbook
+object is ever held in memory); Excel itself caps a sheet at 1,048,576 rows.
+"""
+import csv
+import re
+import zipfile
+from datetime import datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'json': ('application/json', 'json'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+FLUSH_ROWS = 500
+XLSX_MAX_ROWS = 1048576
+
+
+class _Buffer:
+    """Write-only file object whose contents are drained by the generator."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(part.encode('utf-8') if isinstance(part, str) else part for part in self.parts)
+        self.parts = []
+        return data
+
+
+def _cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    return str(value)
+
+
+def stream_csv(headers, rows):
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_cell_text(value) for value in row])
+        if count % FLUSH_ROWS == 0:
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def stream_ndjson(headers, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode(dict(zip(headers, row))))
+        if len(lines) == FLUSH_ROWS:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def stream_json(headers, rows):
+    """A single JSON array, for consumers that cannot read NDJSON."""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    parts = ['[']
+    for count, row in enumerate(rows):
+        parts.append((',' if count else '') + encoder.encode(dict(zip(headers, row))))
+        if len(parts) >= FLUSH_ROWS:
+            yield ''.join(parts).encode('utf-8')
+            parts = []
+    parts.append(']')
+    yield ''.join(parts).encode('utf-8')
+
+
+# Characters XML 1.0 does not allow, even escaped.
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font/><font><b/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="2"><xf/><xf fontId="1" applyFont="1"/></cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+
+def _xlsx_cell(value, style=''):
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c{style}><v>{value}</v></c>'
+    text = _ILLEGAL_XML.sub('', _cell_text(value))
+    return f'<c t="inlineStr"{style}><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def stream_xlsx(headers, rows, sheet_name='Export'):
+    buffer = _Buffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ))
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                '<row>' + ''.join(_xlsx_cell(header, ' s="1"') for header in headers) + '</row>'
+            ).encode('utf-8'))
+            parts = []
+            for count, row in enumerate(rows, 2):
+                if count > XLSX_MAX_ROWS:
+                    break
+                parts.append('<row>' + ''.join(_xlsx_cell(value) for value in row) + '</row>')
+                if len(parts) == FLUSH_ROWS:
+                    sheet.write(''.join(parts).encode('utf-8'))
+                    parts = []
+                    yield buffer.drain()
+            parts.append('</sheetData></worksheet>')
+            sheet.write(''.join(parts).encode('utf-8'))
+    yield buffer.drain()
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+    'json': stream_json,
+    'xlsx': stream_xlsx,
+}
+
+
+def streaming_export(format_type, filename, headers, rows):
+    """
+    A :class:`StreamingHttpResponse` downloading ``rows`` as
+    ``<filename>_<timestamp>.<ext>``; raises ``KeyError`` for unknown formats.
+    """
+    content_type, extension = FORMATS[format_type]
+    response = StreamingHttpResponse(STREAMS[format_type](headers, rows), content_type=content_type)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    response['Content-Disposition'] = f'attachment; filename="{filename}_{stamp}.{extension}"'
+    response['X-Accel-Buffering'] = 'no'
+    return response
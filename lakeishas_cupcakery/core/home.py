@@ -0,0 +1,113 @@
+"""
+The ``/api/home/`` bundle: active categories, featured products and the
+latest published blog posts in one response.
+
+The JSON is rendered once and cached as bytes, so a warm request does no
+queries, no serialization and no authentication. Saves and deletes of the
+models it is built from (see :func:`invalidate_home_bundle_on_change`) bump a
+generation counter, which orphans the cached blob; a build that races with an
+invalidation stores its result under the old generation, where it is never
+read.
+
+The default cache is per process, so a write seen by one worker only clears
+that worker's copy; ``HOME_BUNDLE_TIMEOUT`` (seconds, default 300) bounds how
+stale the others can be.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+CACHE_PREFIX = 'home-bundle:'
+GENERATION_KEY = CACHE_PREFIX + 'generation'
+DEFAULT_TIMEOUT = 300
+DEFAULT_RECENT_POSTS = 3
+
+
+def _generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def invalidate_home_bundle(**kwargs):
+    """Drop every cached bundle (all hosts) by moving to a new generation."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, None)
+
+
+def invalidate_home_bundle_on_change(*models):
+    """Invalidate the bundle whenever one of ``models`` is saved or deleted."""
+    for model in models:
+        uid = f'home-bundle-{model._meta.label_lower}'
+        post_save.connect(invalidate_home_bundle, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_home_bundle, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(invalidate_home_bundle, sender=field.remote_field.through, dispatch_uid=uid)
+
+
+def build_home_bundle(request):
+    from apps.blog.models import BlogPost
+    from apps.blog.serializers import BlogPostSummarySerializer
+    from apps.products.models import Category, Product
+    from apps.products.serializers import CategorySerializer, ProductValuesSerializer
+
+    context = {'request': request}
+    categories = Category.objects.filter(is_active=True)
+    featured = ProductValuesSerializer.values(
+        Product.objects.filter(is_featured=True, is_available=True)
+    )
+    limit = getattr(settings, 'HOME_RECENT_POSTS', DEFAULT_RECENT_POSTS)
+    posts = (
+        BlogPost.objects.filter(is_published=True)
+        .order_by('-published_date', '-created_at')
+        .prefetch_related('categories')[:limit]
+    )
+    return {
+        'categories': CategorySerializer(categories, many=True, context=context).data,
+        'featured_products': ProductValuesSerializer(featured, request).data,
+        'recent_posts': BlogPostSummarySerializer(posts, many=True, context=context).data,
+    }
+
+
+def get_home_bundle(request):
+    """Return ``(body, etag)`` for this host, building and caching it if needed."""
+    # Image URLs are absolute, so each scheme/host gets its own copy.
+    key = f'{CACHE_PREFIX}{_generation()}:{request.scheme}://{request.get_host()}'
+    cached = cache.get(key)
+    if cached is None:
+        body = json.dumps(build_home_bundle(request), cls=DjangoJSONEncoder).encode('utf-8')
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        cached = (body, etag)
+        cache.set(key, cached, getattr(settings, 'HOME_BUNDLE_TIMEOUT', DEFAULT_TIMEOUT))
+    return cached
+
+
+class HomeView(APIView):
+    """
+    Everything the storefront home page needs in one request: active
+    categories, featured products and recent blog posts, served from a
+    pre-rendered cached blob.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []  # Public and identical for every caller
+
+    def get(self, request, *args, **kwargs):
+        body, etag = get_home_bundle(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,140 @@
+"""
+``Idempotency-Key`` support for POST endpoints that must not run twice
+(checkout, contact form, payments).
+
+A client sends a unique key with the request and the same key with every
+retry. The first request claims the key with an ``INSERT`` into
+:class:`~core.models.IdempotencyKey`, runs the view and stores the response;
+retries get the stored response back from the cache (one lookup, the view
+does not run again) or, after a cache miss, from the table. While the first
+request is still running a retry gets 409, and reusing a key with a
+different payload gets 422. Exceptions raised by the view (validation errors
+included) and 5xx responses release the key, so a retry runs the view again.
+
+Keys are scoped to the view and the signed-in user, live for
+``IDEMPOTENCY_KEY_TTL`` seconds (default 24 hours) and are deleted in
+batches by ``manage.py prune_idempotency_keys``.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL = 24 * 60 * 60
+# A claim this old without a response belonged to a request that died.
+STALE_CLAIM_SECONDS = 5 * 60
+CACHE_PREFIX = 'idempotency:'
+
+
+def ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', DEFAULT_TTL)
+
+
+def scoped_key(scope, user, key):
+    owner = user.pk if user is not None and user.is_authenticated else ''
+    return hashlib.sha256(f'{scope}|{owner}|{key}'.encode('utf-8')).hexdigest()
+
+
+def fingerprint(request):
+    payload = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f'{request.method}|{request.path}|{payload}'.encode('utf-8')).hexdigest()
+
+
+def replay(status_code, body):
+    response = Response(json.loads(body) if body else None, status=status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def error(message, status_code):
+    return Response({'detail': message}, status=status_code)
+
+
+def claim(key, digest):
+    """
+    Claim ``key`` for this request. Returns ``None`` when the caller should
+    run the view, or the :class:`IdempotencyKey` row another request owns.
+    """
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(key=key, fingerprint=digest)
+            return None
+        except IntegrityError:
+            row = IdempotencyKey.objects.filter(key=key).first()
+            if row is None:
+                continue
+            now = timezone.now()
+            expired = row.created_at < now - timedelta(seconds=ttl())
+            abandoned = row.status_code is None and row.created_at < now - timedelta(seconds=STALE_CLAIM_SECONDS)
+            if not (expired or abandoned):
+                return row
+            IdempotencyKey.objects.filter(pk=row.pk, created_at=row.created_at).delete()
+    return IdempotencyKey.objects.filter(key=key).first()
+
+
+def run_idempotent(scope, request, run):
+    """Run ``run()`` (the view) at most once per ``Idempotency-Key`` header value."""
+    raw_key = request.headers.get(HEADER)
+    if not raw_key:
+        return run()
+    if len(raw_key) > MAX_KEY_LENGTH:
+        return error(f'{HEADER} must be at most {MAX_KEY_LENGTH} characters.', status.HTTP_400_BAD_REQUEST)
+
+    key = scoped_key(scope, request.user, raw_key)
+    digest = fingerprint(request)
+    cached = cache.get(CACHE_PREFIX + key)
+    if cached is not None:
+        cached_digest, status_code, body = cached
+        if cached_digest != digest:
+            return error(f'This {HEADER} was used with a different request.', status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return replay(status_code, body)
+
+    row = claim(key, digest)
+    if row is not None:
+        if row.fingerprint != digest:
+            return error(f'This {HEADER} was used with a different request.', status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if row.status_code is None:
+            return error('A request with this key is still being processed.', status.HTTP_409_CONFLICT)
+        cache.set(CACHE_PREFIX + key, (row.fingerprint, row.status_code, row.response), ttl())
+        return replay(row.status_code, row.response)
+
+    try:
+        response = run()
+    except Exception:
+        IdempotencyKey.objects.filter(key=key).delete()
+        raise
+    if response.status_code >= 500:
+        IdempotencyKey.objects.filter(key=key).delete()
+        return response
+
+    body = JSONRenderer().render(response.data).decode('utf-8') if response.data is not None else ''
+    IdempotencyKey.objects.filter(key=key).update(status_code=response.status_code, response=body)
+    cache.set(CACHE_PREFIX + key, (digest, response.status_code, body), ttl())
+    return response
+
+
+def prune_keys(batch_size=5000):
+    """Delete keys older than the TTL in batches of ``batch_size`` rows; returns the count."""
+    cutoff = timezone.now() - timedelta(seconds=ttl())
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(created_at__lt=cutoff)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
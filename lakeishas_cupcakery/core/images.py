@@ -0,0 +1,281 @@
+"""
+Responsive image derivatives.
+
+When a model registered with :func:`register_image_derivatives` saves a newly
+uploaded image, the derivatives are produced after the transaction commits
+and off the request path: an I/O thread reads the original from storage, a
+process pool does the Pillow work, and the results are written next to the
+original::
+
+    products/eclair.jpg
+    products/eclair__w320.webp   products/eclair__w320.jpg
+    products/eclair__w640.webp   products/eclair__w640.jpg
+    ...
+    products/eclair__placeholder.jpg   (tiny blurred preview)
+    products/eclair__variants.json     (widths produced + inline placeholder)
+
+Once they are written, the rows that own the image get their ``auto_now``
+timestamp bumped and the home bundle is retired, so ETags and the cached home
+page stop serving ``image_variants: null``.
+
+Serializers expose them through :class:`ImageVariantsField`. Widths are set
+with ``IMAGE_DERIVATIVE_WIDTHS`` and the pool size with
+``IMAGE_DERIVATIVE_WORKERS``.
+"""
+import base64
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = (320, 640, 1024, 1600)
+FORMATS = (('webp', 'WEBP', 'webp'), ('jpeg', 'JPEG', 'jpg'))
+PLACEHOLDER_WIDTH = 16
+CACHE_PREFIX = 'image-derivatives:'
+MISSING = 'missing'
+MISSING_TIMEOUT = 60
+
+# (model, field name) pairs, used by the backfill command.
+registry = []
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def derivative_widths():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS))
+
+
+def derivative_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}__w{width}.{extension}'
+
+
+def placeholder_name(name):
+    root, _ = os.path.splitext(name)
+    return f'{root}__placeholder.jpg'
+
+
+def manifest_name(name):
+    root, _ = os.path.splitext(name)
+    return f'{root}__variants.json'
+
+
+def render_derivatives(data, widths):
+    """
+    Resize ``data`` (the original image bytes) to each width in every output
+    format, plus a blurred placeholder. Returns ``{key: bytes}`` keyed by
+    ``(width, extension)`` and ``'placeholder'``. Runs in a worker process,
+    so it only depends on Pillow.
+    """
+    from PIL import Image, ImageFilter, ImageOps
+
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+
+    outputs = {}
+    # Never upscale: widths beyond the original collapse into one copy at
+    # the original width, so every srcset descriptor is truthful.
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        for _, pillow_format, extension in FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, pillow_format, quality=80, optimize=True)
+            outputs[(width, extension)] = buffer.getvalue()
+
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, 'JPEG', quality=50)
+    outputs['placeholder'] = buffer.getvalue()
+    return outputs
+
+
+def save_derivatives(name, outputs, storage=default_storage):
+    for key, data in outputs.items():
+        target = placeholder_name(name) if key == 'placeholder' else derivative_name(name, *key)
+        if storage.exists(target):
+            storage.delete(target)
+        storage.save(target, ContentFile(data))
+
+    manifest = {
+        'widths': sorted({key[0] for key in outputs if key != 'placeholder'}),
+        'placeholder': 'data:image/jpeg;base64,' + base64.b64encode(outputs['placeholder']).decode('ascii'),
+    }
+    target = manifest_name(name)
+    if storage.exists(target):
+        storage.delete(target)
+    storage.save(target, ContentFile(json.dumps(manifest).encode('utf-8')))
+    cache.set(CACHE_PREFIX + name, manifest, None)
+    touch_owners(name)
+
+
+def modified_field(model):
+    """Name of the model's ``auto_now`` timestamp, or ``None``."""
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            return field.name
+    return None
+
+
+def touch_owners(name):
+    """Mark every row that uses image ``name`` as modified now that its derivatives exist."""
+    from .home import invalidate_home_bundle
+
+    now = timezone.now()
+    for model, field_name in registry:
+        timestamp = modified_field(model)
+        if timestamp is not None:
+            model._default_manager.filter(**{field_name: name}).update(**{timestamp: now})
+    invalidate_home_bundle()
+
+
+def _executor(kind):
+    with _executors_lock:
+        if kind not in _executors:
+            if kind == 'cpu':
+                _executors[kind] = ProcessPoolExecutor(
+                    max_workers=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2),
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            else:
+                _executors[kind] = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-derivatives')
+        return _executors[kind]
+
+
+def _process(name):
+    try:
+        with default_storage.open(name, 'rb') as original:
+            data = original.read()
+        outputs = _executor('cpu').submit(render_derivatives, data, derivative_widths()).result()
+        save_derivatives(name, outputs)
+    except Exception:
+        logger.exception('Could not generate image derivatives for %s', name)
+
+
+def schedule_derivatives(name):
+    """Queue derivative generation for an uploaded file; returns immediately."""
+    cache.delete(CACHE_PREFIX + name)
+    _executor('io').submit(_process, name)
+
+
+def _mark_new_uploads(sender, instance, **kwargs):
+    pending = []
+    for field_name in sender._image_derivative_fields:
+        file = getattr(instance, field_name)
+        # Same test FileField.pre_save uses to decide the file must be written.
+        if file and not file._committed:
+            pending.append(field_name)
+    instance._pending_image_derivatives = pending
+
+
+def _schedule_new_uploads(sender, instance, **kwargs):
+    for field_name in getattr(instance, '_pending_image_derivatives', ()):
+        name = getattr(instance, field_name).name
+        transaction.on_commit(lambda name=name: schedule_derivatives(name))
+    instance._pending_image_derivatives = []
+
+
+def register_image_derivatives(model, *field_names):
+    """Generate derivatives whenever ``model`` saves a new file in ``field_names``."""
+    model._image_derivative_fields = field_names
+    registry.extend((model, field_name) for field_name in field_names)
+    uid = f'image-derivatives-{model._meta.label_lower}'
+    pre_save.connect(_mark_new_uploads, sender=model, dispatch_uid=uid)
+    post_save.connect(_schedule_new_uploads, sender=model, dispatch_uid=uid)
+
+
+def get_manifests(names, storage=default_storage):
+    """
+    Return ``{name: manifest}`` for every name in ``names``, where a manifest
+    is ``{'widths': [...], 'placeholder': data_uri}``, or ``None`` while its
+    derivatives have not been generated yet. One ``cache.get_many`` covers
+    the lot; storage is only read for names the cache has not seen.
+    """
+    names = {name for name in names if name}
+    found = cache.get_many([CACHE_PREFIX + name for name in names])
+    manifests, misses = {}, {}
+    for name in names:
+        manifest = found.get(CACHE_PREFIX + name)
+        if manifest is None:
+            target = manifest_name(name)
+            if storage.exists(target):
+                with storage.open(target, 'rb') as stored:
+                    manifest = json.loads(stored.read())
+                cache.set(CACHE_PREFIX + name, manifest, None)
+            else:
+                misses[CACHE_PREFIX + name] = manifest = MISSING
+        manifests[name] = None if manifest == MISSING else manifest
+    if misses:
+        cache.set_many(misses, MISSING_TIMEOUT)
+    return manifests
+
+
+def get_manifest(name, storage=default_storage):
+    """The manifest for one image (see :func:`get_manifests`), or ``None``."""
+    return get_manifests([name], storage).get(name)
+
+
+def image_variants(name, request=None, storage=default_storage, manifest=MISSING, url_prefix=None):
+    """
+    The srcset/placeholder payload for one stored image, or ``None``.
+
+    Callers rendering many images pass the ``manifest`` from
+    :func:`get_manifests` and, for file system storage, the absolute
+    ``url_prefix`` of ``MEDIA_URL`` so no URL is built per derivative.
+    """
+    if not name:
+        return None
+    if manifest == MISSING:
+        manifest = get_manifest(name, storage)
+    if manifest is None:
+        return None
+
+    def url(target):
+        if url_prefix is not None:
+            return url_prefix + filepath_to_uri(target).lstrip('/')
+        return request.build_absolute_uri(storage.url(target)) if request is not None else storage.url(target)
+
+    return {
+        'srcset': {
+            fmt: ', '.join(
+                f'{url(derivative_name(name, width, extension))} {width}w'
+                for width in manifest['widths']
+            )
+            for fmt, _, extension in FORMATS
+        },
+        'widths': manifest['widths'],
+        'placeholder': manifest['placeholder'],
+    }
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only field that renders an image field's derivatives as ``srcset``
+    strings (WebP and JPEG) plus an inline blurred placeholder. It is
+    ``null`` until the derivatives exist, so clients fall back to the
+    original image.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return image_variants(value.name if value else None, self.context.get('request'))
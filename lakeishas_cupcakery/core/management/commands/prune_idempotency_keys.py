@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.idempotency import prune_keys
+
+
+class Command(BaseCommand):
+    help = 'Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows deleted per statement (default: 5000)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        deleted = prune_keys(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} idempotency keys'))
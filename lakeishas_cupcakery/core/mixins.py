@@ -0,0 +1,208 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Count, Max, Prefetch
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs on viewset ``list``/``retrieve`` with 304 Not Modified.
+
+    The validators come from one cheap aggregate over the filtered queryset:
+    ``max(last_modified_field)`` plus the max of every related timestamp the
+    serializer renders (``related_last_modified_fields``), the row count, the
+    distinct count of every related set the serializer counts
+    (``related_count_fields``), the full request path and whether the caller is staff (staff may see
+    unpublished rows). When the client's ``If-None-Match``/``If-Modified-Since``
+    still match, the response is returned before the page is fetched or any
+    serializer runs.
+    """
+    last_modified_field = 'updated_at'
+    # Timestamps of nested relations, e.g. ('category__updated_at',). Joining a
+    # to-many relation makes the row count count links, so adding or removing
+    # one changes the ETag too.
+    related_last_modified_fields = ()
+    # Related sets whose size is rendered, e.g. ('comments',). Deleting a row
+    # need not move any max timestamp, so their distinct counts are part of
+    # the ETag.
+    related_count_fields = ()
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_validators(self, request):
+        timestamps = (self.last_modified_field,) + tuple(self.related_last_modified_fields)
+        stats = self.get_validator_queryset().order_by().aggregate(
+            *[Max(field) for field in timestamps],
+            *[Count(field, distinct=True) for field in self.related_count_fields],
+            count=Count('pk'),
+        )
+        changed = [stats[f'{field}__max'] for field in timestamps]
+        last_modified = max((value for value in changed if value is not None), default=None)
+        fingerprint = '|'.join([
+            *(value.isoformat() if value else '' for value in changed),
+            str(stats['count']),
+            *(str(stats[f'{field}__count']) for field in self.related_count_fields),
+            request.get_full_path(),
+            'staff' if request.user.is_staff else 'public',
+        ])
+        etag = quote_etag(hashlib.md5(fingerprint.encode('utf-8')).hexdigest())
+        # HTTP dates have one-second resolution; the ETag catches finer changes.
+        return etag, int(last_modified.timestamp()) if last_modified else None
+
+    def conditional_dispatch(self, handler, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        try:
+            etag, last_modified = self.get_validators(request)
+        except (TypeError, ValueError, ValidationError):
+            # A malformed lookup value; let the handler answer 404 as get_object does.
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Make browsers revalidate instead of heuristically caching.
+            patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_dispatch(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_dispatch(super().retrieve, request, *args, **kwargs)
+
+
+def parse_field_list(value):
+    """``'a, b'`` -> ``{'a', 'b'}``; a missing parameter (``None``) stays ``None``."""
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    ModelSerializer half of sparse fieldsets: skip fields the request did not
+    ask for (``?fields=``) and collapse nested relations it did not expand
+    (``?expand=``) to primary keys. The choices arrive through the context
+    set by :class:`SparseFieldsetMixin`; without them nothing changes.
+    """
+    # Nested field name -> factory for its collapsed (primary key) form.
+    collapsed_fields = {}
+    # SerializerMethodField name -> model fields the method reads.
+    method_field_sources = {}
+
+    def get_sparse_fieldset(self):
+        # Only the top-level serializer (or the child of a many=True root)
+        # is narrowed; nested serializers render in full.
+        root = self.root
+        if root is not self and getattr(root, 'child', None) is not self:
+            return None, None
+        return self.context.get('sparse_fields'), self.context.get('sparse_expand')
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        fields, _ = self.get_sparse_fieldset()
+        if fields is None:
+            return names
+        # Unrequested fields are never built, let alone rendered.
+        return [name for name in names if name in fields]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        _, expand = self.get_sparse_fieldset()
+        if expand is not None:
+            for name, collapsed in self.collapsed_fields.items():
+                if name in fields and name not in expand:
+                    fields[name] = collapsed()
+        return fields
+
+    def narrow_queryset(self, queryset):
+        """
+        Restrict ``queryset`` to the columns and relations the remaining
+        fields read: ``.only()`` for columns, ``select_related`` for expanded
+        foreign keys and ``prefetch_related`` for to-many relations (just the
+        ids when collapsed). Anything it cannot map leaves the queryset as is.
+        """
+        opts = queryset.model._meta
+        only, select, prefetch = {opts.pk.name}, [], []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in self.method_field_sources:
+                    return queryset
+                sources = self.method_field_sources[name]
+            elif field.source == '*':
+                return queryset
+            else:
+                sources = (field.source.split('.')[0],)
+
+            nested = isinstance(field, serializers.BaseSerializer)
+            for source in sources:
+                try:
+                    model_field = opts.get_field(source)
+                except FieldDoesNotExist:
+                    return queryset
+                if model_field.many_to_many or model_field.one_to_many:
+                    related = model_field.related_model
+                    prefetch.append(source if nested else Prefetch(
+                        source, queryset=related._default_manager.only(related._meta.pk.name)
+                    ))
+                else:
+                    only.add(source)
+                    if nested and model_field.is_relation:
+                        select.append(source)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*only)
+
+
+class SparseFieldsetMixin:
+    """
+    Honour ``?fields=name,slug`` and ``?expand=category`` on safe requests.
+
+    The serializer (see :class:`SparseFieldsetSerializerMixin`) skips the
+    fields that were not requested, and ``filter_queryset`` narrows the
+    queryset's columns and joins to match. Without ``expand`` every nested
+    relation stays expanded, as before; ``expand=`` (empty) collapses all of
+    them to ids.
+    """
+
+    def get_sparse_fieldset(self):
+        if self.request.method not in SAFE_METHODS:
+            return None, None
+        params = self.request.query_params
+        return parse_field_list(params.get('fields')), parse_field_list(params.get('expand'))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'], context['sparse_expand'] = self.get_sparse_fieldset()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_fieldset() == (None, None):
+            return queryset
+        serializer = self.get_serializer()
+        if isinstance(serializer, SparseFieldsetSerializerMixin):
+            queryset = serializer.narrow_queryset(queryset)
+        return queryset
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of a POST sent with an ``Idempotency-Key`` header (see
+    ``core/idempotency.py``). Only hashes and the response are kept; rows
+    expire after ``IDEMPOTENCY_KEY_TTL`` and are pruned in batches.
+    """
+    # sha256 of view, user and the client's key.
+    key = models.CharField(max_length=64, unique=True)
+    # sha256 of the request payload; a reused key with another payload is refused.
+    fingerprint = models.CharField(max_length=64)
+    # Null while the first request is still running.
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.key[:12]} ({self.status_code or "running"})'
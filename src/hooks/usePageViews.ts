@@ -0,0 +1,15 @@
+import { useEffect, useRef } from 'react';
+import { useLocation } from 'react-router-dom';
+import { analyticsApi } from '@/lib/api';
+
+// Send one page view per client-side navigation; the previous route is the referrer.
+export const usePageViews = () => {
+  const location = useLocation();
+  const previousUrl = useRef(document.referrer);
+
+  useEffect(() => {
+    const url = window.location.href;
+    analyticsApi.trackPageView(url, previousUrl.current);
+    previousUrl.current = url;
+  }, [location.pathname, location.search]);
+};
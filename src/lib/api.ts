@@ -147,6 +147,16 @@ export const contactApi = {
   }) => api.post('/contact/', data),
 };
 
+export const analyticsApi = {
+  // Form-encoded, so sendBeacon needs no CORS preflight; the endpoint always answers 204.
+  trackPageView: (url: string, referrer: string) => {
+    const endpoint = `${publicApi.defaults.baseURL}/analytics/hit/`;
+    const body = new URLSearchParams({ url, referrer });
+    if (navigator.sendBeacon?.(endpoint, body)) return;
+    fetch(endpoint, { method: 'POST', body, keepalive: true }).catch(() => undefined);
+  },
+};
+
 export const authApi = {
   // Use publicApi for login/register to avoid credentialed CORS
   login: <T = any>(email: string, password: string) => 
@@ -13,6 +13,11 @@ else
     echo "lakeishas_cupcakery directory not found, assuming we are already inside..."
 fi
 
-# Start Gunicorn
-echo "Starting Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:$PORT
+# Admin exports are queued as jobs and written to MEDIA_ROOT by this worker
+echo "Starting export job worker..."
+python manage.py run_export_jobs --workers 2 &
+
+# Start Gunicorn with uvicorn workers: the ASGI app serves the dashboard's
+# live activity stream (Server-Sent Events) as well as every regular request
+echo "Starting Gunicorn (ASGI)..."
+exec gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT